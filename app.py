@@ -11,16 +11,28 @@ import os
 import re
 import csv
 import io
+import codecs
 import json
+import base64
+import hashlib
+import queue
 import sqlite3
+import threading
+import time
 import secrets as _secrets_mod
+from collections import namedtuple
 from datetime import datetime, date, timedelta, timezone
 from functools import wraps
+import click
 from flask import (
     Flask, render_template, request, redirect, url_for,
-    session, flash, g, jsonify, Response
+    session, flash, g, has_app_context, has_request_context, after_this_request,
+    jsonify, Response, stream_with_context, make_response
 )
+from markupsafe import Markup, escape
+from werkzeug.http import is_resource_modified
 from werkzeug.security import generate_password_hash, check_password_hash
+from rotation import RotationCalendar
 
 app = Flask(__name__)
 
@@ -72,37 +84,133 @@ def today_kst():
 # Item 12: Teams config from JSON
 # ============================================================
 TEAMS_CONFIG_PATH = os.path.join(BASE_DIR, 'teams_config.json')
+# Seconds between mtime checks of teams_config.json (edits apply without a restart)
+TEAMS_CONFIG_CHECK_SECONDS = 5
 
-def load_teams_config():
+def load_teams_config(path=TEAMS_CONFIG_PATH):
     """Load teams configuration from teams_config.json."""
-    with open(TEAMS_CONFIG_PATH, 'r', encoding='utf-8') as f:
+    with open(path, 'r', encoding='utf-8') as f:
         return json.load(f)
 
-_teams_config = load_teams_config()
+
+# Reminder rules (teams_config.json "reminders"): each fires `offset_days` from a
+# duty date, once the KST clock passes `at`, on the listed channels.
+ReminderRule = namedtuple('ReminderRule', ['kind', 'offset_days', 'at', 'channels', 'only_if_unsubmitted'])
+
+DEFAULT_REMINDERS = [
+    {'kind': 'day_before', 'offset_days': -1, 'at': '17:00', 'channels': ['email']},
+    {'kind': 'duty_reminder', 'offset_days': 0, 'at': '09:00', 'channels': ['email', 'dashboard']},
+    {'kind': 'overdue', 'offset_days': 0, 'at': '18:00', 'channels': ['email', 'dashboard'],
+     'only_if_unsubmitted': True},
+]
+
+
+def parse_reminder_rules(config):
+    """Build ReminderRule tuples from the config (or DEFAULT_REMINDERS); raises ValueError on bad entries."""
+    rules = []
+    for r in config.get('reminders', DEFAULT_REMINDERS):
+        channels = tuple(r.get('channels', ['email']))
+        if set(channels) - {'email', 'dashboard'}:
+            raise ValueError(f"Unknown reminder channel in {r['kind']}: {channels}")
+        rules.append(ReminderRule(r['kind'], int(r.get('offset_days', 0)),
+                                  datetime.strptime(r.get('at', '09:00'), '%H:%M').time(),
+                                  channels, bool(r.get('only_if_unsubmitted', False))))
+    return tuple(rules)
+
+
+class TeamsSnapshot:
+    """One parsed teams_config.json plus the lookups derived from it.
+    Built complete and never modified afterwards; treat every attribute as read-only."""
+
+    def __init__(self, config, mtime):
+        self.config = config
+        self.mtime = mtime
+        self.groups = tuple(t['name'] for t in config['teams'])
+        self.teams_display = [{'key': t['key'], 'name': t['name']} for t in config['teams']]
+        self.key_to_group = {t['key']: t['name'] for t in config['teams']}
+        self.group_to_key = {t['name']: t['key'] for t in config['teams']}
+        self.tips_access = frozenset(t['name'] for t in config['teams'] if t.get('tips_access', False))
+        self.rotation = RotationCalendar(config)
+        self.reminders = parse_reminder_rules(config)
+
+
+class TeamsConfigProvider:
+    """Serve the current TeamsSnapshot, reloading the file when its mtime changes.
+    The file is stat'ed at most once per `check_interval` seconds; a reload swaps in
+    a fully built snapshot with one assignment. A file that fails to parse is logged
+    and the previous snapshot stays in service."""
+
+    def __init__(self, path, check_interval):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._listeners = []
+        self._failed_mtime = None
+        self._next_check = time.monotonic() + check_interval
+        self._snapshot = self._load()
+
+    def _load(self):
+        mtime = os.path.getmtime(self.path)
+        return TeamsSnapshot(load_teams_config(self.path), mtime)
+
+    def on_reload(self, callback):
+        """Call `callback(snapshot)` after each successful reload."""
+        self._listeners.append(callback)
+
+    def get(self):
+        now = time.monotonic()
+        if now >= self._next_check and self._lock.acquire(blocking=False):
+            try:
+                self._next_check = now + self.check_interval
+                self._check_for_changes()
+            finally:
+                self._lock.release()
+        return self._snapshot
+
+    def _check_for_changes(self):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return  # Mid-replace or removed; keep serving the current snapshot
+        if mtime in (self._snapshot.mtime, self._failed_mtime):
+            return
+        try:
+            snapshot = TeamsSnapshot(load_teams_config(self.path), mtime)
+        except (OSError, ValueError, KeyError, TypeError) as e:
+            # Warn once per bad version of the file, not on every check
+            self._failed_mtime = mtime
+            app.logger.warning('Keeping previous teams config; reload of %s failed: %s', self.path, e)
+            return
+        self._snapshot = snapshot
+        for callback in self._listeners:
+            callback(snapshot)
+
+
+_teams_provider = TeamsConfigProvider(TEAMS_CONFIG_PATH, TEAMS_CONFIG_CHECK_SECONDS)
+
+def get_teams():
+    """Current teams snapshot; pinned on `g` so one request never mixes two configs."""
+    if not has_app_context():
+        return _teams_provider.get()
+    if 'teams' not in g:
+        g.teams = _teams_provider.get()
+    return g.teams
 
 def get_groups():
     """Return list of group names from config."""
-    return [t['name'] for t in _teams_config['teams']]
+    return list(get_teams().groups)
 
 def get_teams_display():
     """Return list of dicts with key and name for template display."""
-    return [{'key': t['key'], 'name': t['name']} for t in _teams_config['teams']]
+    return get_teams().teams_display
 
 def get_team_key_for_group(group_name):
     """Return team key (A-E) for a group name."""
-    for t in _teams_config['teams']:
-        if t['name'] == group_name:
-            return t['key']
-    return '?'
+    return get_teams().group_to_key.get(group_name, '?')
 
 def has_tips_access(group_name):
     """Check if a group has tips_access privilege (from teams_config.json)."""
-    for t in _teams_config['teams']:
-        if t['name'] == group_name:
-            return t.get('tips_access', False)
-    return False
-
-GROUPS = get_groups()
+    return group_name in get_teams().tips_access
 
 # --- Pre-loaded items ---
 INITIAL_ITEMS = [
@@ -148,12 +256,92 @@ INITIAL_ITEMS = [
 # Database
 # ============================================================
 
+class ConnectionPool:
+    """Thread-safe pool of warm SQLite connections shared by the worker threads.
+    PRAGMAs run once per connection; idle connections are handed out LIFO so a
+    busy thread keeps getting the same hot connection back."""
+
+    def __init__(self, max_idle=8):
+        self.max_idle = max_idle
+        self._lock = threading.Lock()
+        self._idle = []  # list of (db_path, connection)
+        self._pid = os.getpid()
+        self._stats = {'opened': 0, 'reused': 0, 'returned': 0, 'discarded': 0, 'in_use': 0}
+
+    @staticmethod
+    def _connect(path):
+        conn = sqlite3.connect(path, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA foreign_keys=ON')
+        return conn
+
+    def acquire(self, path):
+        """Check out a connection to `path`, opening a new one if none is idle."""
+        stale = []
+        with self._lock:
+            if self._pid != os.getpid():
+                # Forked worker: never reuse the parent's connections
+                self._idle = []
+                self._pid = os.getpid()
+            conn = None
+            while self._idle:
+                idle_path, idle_conn = self._idle.pop()
+                if idle_path == path:
+                    conn = idle_conn
+                    break
+                stale.append(idle_conn)
+            self._stats['discarded'] += len(stale)
+            self._stats['reused' if conn is not None else 'opened'] += 1
+            self._stats['in_use'] += 1
+        for old in stale:
+            old.close()
+        if conn is None:
+            try:
+                conn = self._connect(path)
+            except sqlite3.Error:
+                with self._lock:
+                    self._stats['in_use'] -= 1
+                raise
+        return conn
+
+    def release(self, conn, path):
+        """Return a connection to the pool, rolling back any unfinished transaction."""
+        keep = True
+        try:
+            if conn.in_transaction:
+                conn.rollback()
+        except sqlite3.Error:
+            keep = False
+        with self._lock:
+            self._stats['in_use'] -= 1
+            if keep and self._pid == os.getpid() and len(self._idle) < self.max_idle:
+                self._idle.append((path, conn))
+                self._stats['returned'] += 1
+                return
+            self._stats['discarded'] += 1
+        conn.close()
+
+    def close_all(self):
+        """Close every idle connection (e.g. before replacing the database file)."""
+        with self._lock:
+            idle, self._idle = self._idle, []
+            self._stats['discarded'] += len(idle)
+        for _, conn in idle:
+            conn.close()
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, idle=len(self._idle), max_idle=self.max_idle)
+
+
+_db_pool = ConnectionPool()
+
+
 def get_db():
     if 'db' not in g:
-        g.db = sqlite3.connect(DB_PATH)
-        g.db.row_factory = sqlite3.Row
-        g.db.execute('PRAGMA journal_mode=WAL')
-        g.db.execute('PRAGMA foreign_keys=ON')
+        g.db_path = DB_PATH
+        g.db = _db_pool.acquire(g.db_path)
     return g.db
 
 
@@ -161,7 +349,7 @@ def get_db():
 def close_db(exception):
     db = g.pop('db', None)
     if db is not None:
-        db.close()
+        _db_pool.release(db, g.pop('db_path', DB_PATH))
 
 
 # ============================================================
@@ -185,8 +373,11 @@ def validate_checks_table_name(name):
 
 
 def ensure_checks_table(db, table_name):
-    """Create monthly checks table if it doesn't exist."""
+    """Create monthly checks table if it doesn't exist.
+    Write path only: once the table is in the registry no DDL is issued."""
     validate_checks_table_name(table_name)
+    if checks_table_exists(db, table_name):
+        return
     db.execute(f'''
         CREATE TABLE IF NOT EXISTS "{table_name}" (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -201,19 +392,523 @@ def ensure_checks_table(db, table_name):
             FOREIGN KEY (item_id) REFERENCES items(id) ON DELETE CASCADE
         )
     ''')
-    db.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table_name}_item_group" ON "{table_name}"(item_id, group_name)')
+    db.execute(f'CREATE UNIQUE INDEX IF NOT EXISTS "idx_{table_name}_unique" ON "{table_name}"(item_id, group_name, check_date)')
     db.execute(f'CREATE INDEX IF NOT EXISTS "idx_{table_name}_date" ON "{table_name}"(check_date)')
+    _checks_tables.add(db, table_name)
+
+
+def migrate_checks_unique_key(db, table_name):
+    """Drop duplicate item/group/date rows (keeping the latest) and add the unique key."""
+    validate_checks_table_name(table_name)
+    index_name = f'idx_{table_name}_unique'
+    if db.execute("SELECT 1 FROM sqlite_master WHERE type='index' AND name = ?", (index_name,)).fetchone():
+        return 0
+    removed = db.execute(f'''
+        DELETE FROM "{table_name}" WHERE id NOT IN (
+            SELECT MAX(id) FROM "{table_name}" GROUP BY item_id, group_name, check_date
+        )
+    ''').rowcount
+    db.execute(f'CREATE UNIQUE INDEX "{index_name}" ON "{table_name}"(item_id, group_name, check_date)')
+    # The unique key's (item_id, group_name) prefix makes this index redundant
+    db.execute(f'DROP INDEX IF EXISTS "idx_{table_name}_item_group"')
+    return removed
+
+
+class ChecksTableRegistry:
+    """In-process set of existing checks_YYYY_MM tables.
+    Reloaded from sqlite_master only when the database's schema_version changes."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._key = None  # (db_path, schema_version) the snapshot was taken at
+        self._tables = frozenset()
+        self._sorted = ()
+
+    @staticmethod
+    def _schema_key(db):
+        return DB_PATH, db.execute('PRAGMA schema_version').fetchone()[0]
+
+    def load(self, db):
+        """Rebuild the snapshot from sqlite_master."""
+        key = self._schema_key(db)
+        rows = db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'checks_%'").fetchall()
+        tables = frozenset(row[0] for row in rows if re.match(r'^checks_\d{4}_\d{2}$', row[0]))
+        with self._lock:
+            self._key, self._tables, self._sorted = key, tables, tuple(sorted(tables))
+
+    def _fresh(self, db):
+        if self._schema_key(db) != self._key:
+            self.load(db)
+
+    def add(self, db, table_name):
+        """Record a table just created by ensure_checks_table().
+        Reloads the whole snapshot: another process may have created a month table
+        since the last check, and the new schema_version would otherwise hide it."""
+        self.load(db)
+
+    def tables(self, db):
+        self._fresh(db)
+        return list(self._sorted)
+
+    def contains(self, db, table_name):
+        self._fresh(db)
+        return table_name in self._tables
+
+
+_checks_tables = ChecksTableRegistry()
 
 
 def get_all_checks_tables(db):
     """Return list of all checks_YYYY_MM table names in the database."""
-    rows = db.execute("SELECT name FROM sqlite_master WHERE type='table' AND name LIKE 'checks_%'").fetchall()
-    tables = []
+    return _checks_tables.tables(db)
+
+
+def checks_table_exists(db, table_name):
+    """Set-membership test against the checks table registry."""
+    return _checks_tables.contains(db, table_name)
+
+
+# ============================================================
+# Data version (bumped by write routes; keys the read caches)
+# ============================================================
+
+def get_data_version(db, key='data_version'):
+    """Return a version counter stored in app_meta (the global data version by default)."""
+    row = db.execute("SELECT value FROM app_meta WHERE key = ?", (key,)).fetchone()
+    return row[0] if row else 0
+
+
+def bump_data_version(db, key='data_version'):
+    """Increment a version counter inside the caller's transaction.
+    The bump time (unix seconds) is kept next to it under '<key>_at'."""
+    db.execute('''
+        INSERT INTO app_meta (key, value) VALUES (?, 1)
+        ON CONFLICT(key) DO UPDATE SET value = value + 1
+    ''', (key,))
+    db.execute('''
+        INSERT INTO app_meta (key, value) VALUES (?, CAST(strftime('%s', 'now') AS INTEGER))
+        ON CONFLICT(key) DO UPDATE SET value = excluded.value
+    ''', (f'{key}_at',))
+
+
+# Change log behind /api/dashboard?since=: one row per cell touched by a version.
+# NULL item/group/date means "everything"; entries older than CHANGE_LOG_KEEP
+# versions are pruned and clients that far behind get the full state instead.
+CHANGE_LOG_KEEP = 1000
+
+
+def record_changes(db, kind, cells=None):
+    """Log the cells changed by the current data version ('check', 'order' or 'catalog').
+    `cells` is [(item_id, group_name, check_date)]; None records a change to everything.
+    Call after bump_data_version, inside the same transaction."""
+    if cells is None:
+        cells = [(None, None, None)]
+    if not cells:
+        return
+    version = get_data_version(db)
+    db.executemany(
+        'INSERT INTO change_log (version, kind, item_id, group_name, check_date) VALUES (?, ?, ?, ?, ?)',
+        [(version, kind, item_id, group_name, check_date) for item_id, group_name, check_date in cells])
+    db.execute('DELETE FROM change_log WHERE version <= ?', (version - CHANGE_LOG_KEEP,))
+
+
+def changes_since(db, since):
+    """Return the change_log rows newer than `since`, or None if the log cannot cover the gap."""
+    version = get_data_version(db)
+    floor = max(get_data_version(db, 'change_log_floor'), version - CHANGE_LOG_KEEP)
+    if since > version or since < floor:
+        return None
+    return db.execute('SELECT kind, item_id, group_name, check_date FROM change_log WHERE version > ?',
+                      (since,)).fetchall()
+
+
+# ============================================================
+# Item catalog cache (items change only through the admin item routes)
+# ============================================================
+
+_item_catalog = (None, None)  # (catalog_version, catalog)
+
+
+def get_item_catalog(db):
+    """Return the item catalog, rebuilt only after an item route bumps catalog_version.
+    Keys: items (rows by sort_order), by_id, position, places [(stock_place, [item dict])], count.
+    The structures are shared between requests and must be treated as read-only."""
+    global _item_catalog
+    version = get_data_version(db, 'catalog_version')
+    cached_version, catalog = _item_catalog
+    if cached_version == version:
+        return catalog
+
+    items = db.execute('SELECT * FROM items ORDER BY sort_order').fetchall()
+
+    # Organize items by stock_place
+    places = []
+    current_place = None
+    current_items = []
+    for item in items:
+        if item['stock_place'] != current_place:
+            if current_place is not None:
+                places.append((current_place, current_items))
+            current_place = item['stock_place']
+            current_items = []
+        current_items.append(dict(item))
+    if current_place is not None:
+        places.append((current_place, current_items))
+
+    catalog = {
+        'items': items,
+        'by_id': {item['id']: item for item in items},
+        'position': {item['id']: pos for pos, item in enumerate(items)},
+        'places': places,
+        'count': len(items),
+    }
+    _item_catalog = (version, catalog)
+    return catalog
+
+
+def invalidate_item_catalog(db):
+    """Mark the catalog stale for every worker (call before committing an item change)."""
+    global _item_catalog
+    bump_data_version(db, 'catalog_version')
+    bump_data_version(db)
+    record_changes(db, 'catalog')
+    _item_catalog = (None, None)
+
+
+# ============================================================
+# Partitioned checks queries (one API over all checks_YYYY_MM tables)
+# ============================================================
+
+CHECK_ROW_COLUMNS = (
+    'c.id AS id', 'c.item_id AS item_id', 'c.group_name AS group_name',
+    'c.checked_by AS checked_by', 'c.quantity AS quantity', 'c.status AS status',
+    'c.note AS note', 'c.check_date AS check_date', 'c.created_at AS created_at',
+    'i.item_name AS item_name', 'i.stock_place AS stock_place',
+    'i.minimum AS minimum', 'i.sort_order AS sort_order',
+)
+
+
+def checks_partitions(db, date_from=None, date_to=None, newest_first=True):
+    """Existing monthly tables that can hold rows in [date_from, date_to] (inclusive ISO dates)."""
+    low = get_checks_table(date_from) if date_from else None
+    high = get_checks_table(date_to) if date_to else None
+    tables = [t for t in get_all_checks_tables(db)
+              if (low is None or t >= low) and (high is None or t <= high)]
+    return tables[::-1] if newest_first else tables
+
+
+def _checks_filter(date_from=None, date_to=None, group=None, item_ids=None):
+    """WHERE clause (unqualified columns) and params shared by every partition."""
+    where = ['1=1']
+    params = []
+    if date_from and date_from == date_to:
+        where.append('check_date = ?')
+        params.append(date_from)
+    else:
+        if date_from:
+            where.append('check_date >= ?')
+            params.append(date_from)
+        if date_to:
+            where.append('check_date <= ?')
+            params.append(date_to)
+    if group:
+        where.append('group_name = ?')
+        params.append(group)
+    if item_ids is not None:
+        item_ids = list(item_ids)
+        where.append(f"item_id IN ({', '.join('?' * len(item_ids)) or 'NULL'})")
+        params.extend(item_ids)
+    return ' AND '.join(where), params
+
+
+def _partition_select(tbl, where, params, order_by, limit, extra=None):
+    """SELECT for one partition with filters, ORDER BY and LIMIT pushed down.
+    `extra` is an optional (sql, params) condition on the qualified c./i. columns."""
+    sql = f'''
+        SELECT {', '.join(CHECK_ROW_COLUMNS)}
+        FROM "{tbl}" c JOIN items i ON c.item_id = i.id
+        WHERE {where}
+    '''
+    part_params = list(params)
+    if extra:
+        sql += f' AND {extra[0]}'
+        part_params += extra[1]
+    if order_by:
+        sql += f' ORDER BY {order_by}'
+    if limit is not None:
+        sql += ' LIMIT ?'
+        part_params.append(limit)
+    return sql, part_params
+
+
+def query_checks(db, date_from=None, date_to=None, group=None, item_ids=None,
+                 order_by='check_date DESC', limit=None, offset=0):
+    """Rows from every partition that can match, merged with a single UNION ALL.
+    Each partition only returns its own top `limit + offset` rows."""
+    tables = checks_partitions(db, date_from, date_to)
+    if not tables:
+        return []
+    where, params = _checks_filter(date_from, date_to, group, item_ids)
+    part_limit = limit + offset if limit is not None else None
+    parts = []
+    all_params = []
+    for tbl in tables:
+        sql, part_params = _partition_select(tbl, where, params, order_by, part_limit)
+        parts.append(f'SELECT * FROM ({sql})')
+        all_params += part_params
+    full_query = ' UNION ALL '.join(parts)
+    if order_by:
+        full_query += f' ORDER BY {order_by}'
+    if limit is not None:
+        full_query += ' LIMIT ? OFFSET ?'
+        all_params += [limit, offset]
+    return db.execute(full_query, all_params).fetchall()
+
+
+def iter_checks(db, date_from=None, date_to=None, group=None, item_ids=None,
+                order_by='check_date DESC'):
+    """Yield matching rows one partition at a time, newest month first.
+    With a check_date DESC ordering the overall stream stays date-ordered."""
+    where, params = _checks_filter(date_from, date_to, group, item_ids)
+    for tbl in checks_partitions(db, date_from, date_to):
+        sql, part_params = _partition_select(tbl, where, params, order_by, None)
+        yield from db.execute(sql, part_params)
+
+
+def count_checks(db, date_from=None, date_to=None, group=None, item_ids=None):
+    """Total matching rows, summed per partition."""
+    where, params = _checks_filter(date_from, date_to, group, item_ids)
+    total = 0
+    for tbl in checks_partitions(db, date_from, date_to):
+        total += db.execute(f'SELECT COUNT(*) FROM "{tbl}" WHERE {where}', params).fetchone()[0]
+    return total
+
+
+# Keyset pagination order: newest date first, then item name, then id as tie-breaker
+KEYSET_ORDER = 'check_date DESC, item_name, id'
+KEYSET_ORDER_REVERSED = 'check_date, item_name DESC, id DESC'
+
+
+def encode_checks_cursor(row):
+    """Opaque URL-safe cursor for a history row: (check_date, item_name, id)."""
+    raw = json.dumps([row['check_date'], row['item_name'], row['id']], ensure_ascii=False)
+    return base64.urlsafe_b64encode(raw.encode('utf-8')).decode('ascii').rstrip('=')
+
+
+def decode_checks_cursor(cursor):
+    """Inverse of encode_checks_cursor(). Returns None for a malformed cursor."""
+    if not cursor:
+        return None
+    try:
+        raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+        check_date, item_name, row_id = json.loads(raw.decode('utf-8'))
+        date.fromisoformat(check_date)
+        return str(check_date), str(item_name), int(row_id)
+    except (ValueError, TypeError):
+        return None
+
+
+def keyset_checks(db, date_from=None, date_to=None, group=None, after=None, before=None, limit=50):
+    """One page of history rows strictly after (or before) a decoded cursor.
+    Returns (rows, has_more) where has_more refers to the direction of travel.
+    Months beyond the cursor's month are pruned, and no rows are skipped with OFFSET."""
+    if after:
+        d, name, row_id = after
+        extra = ('(c.check_date < ? OR (c.check_date = ? AND '
+                 '(i.item_name > ? OR (i.item_name = ? AND c.id > ?))))',
+                 [d, d, name, name, row_id])
+        date_to = min(date_to, d) if date_to else d
+        order_by = KEYSET_ORDER
+    elif before:
+        d, name, row_id = before
+        extra = ('(c.check_date > ? OR (c.check_date = ? AND '
+                 '(i.item_name < ? OR (i.item_name = ? AND c.id < ?))))',
+                 [d, d, name, name, row_id])
+        date_from = max(date_from, d) if date_from else d
+        order_by = KEYSET_ORDER_REVERSED
+    else:
+        extra = None
+        order_by = KEYSET_ORDER
+
+    tables = checks_partitions(db, date_from, date_to)
+    if not tables:
+        return [], False
+    where, params = _checks_filter(date_from, date_to, group)
+    parts = []
+    all_params = []
+    for tbl in tables:
+        sql, part_params = _partition_select(tbl, where, params, order_by, limit + 1, extra)
+        parts.append(f'SELECT * FROM ({sql})')
+        all_params += part_params
+    full_query = ' UNION ALL '.join(parts) + f' ORDER BY {order_by} LIMIT ?'
+    rows = db.execute(full_query, all_params + [limit + 1]).fetchall()
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if before:
+        rows.reverse()
+    return rows, has_more
+
+
+_check_dates_cache = (None, [])  # (data_version, dates newest first)
+
+
+def get_check_dates(db):
+    """Distinct check dates across all partitions, newest first.
+    Recomputed only when a write has bumped the data version."""
+    global _check_dates_cache
+    version = get_data_version(db)
+    cached_version, dates = _check_dates_cache
+    if cached_version == version:
+        return dates
+    dates = []
+    for tbl in checks_partitions(db):
+        dates += [r['check_date'] for r in
+                  db.execute(f'SELECT DISTINCT check_date FROM "{tbl}" ORDER BY check_date DESC')]
+    _check_dates_cache = (version, dates)
+    return dates
+
+
+_count_cache = {}  # (date_from, date_to, group) -> (data_version, total)
+
+
+def cached_count_checks(db, date_from=None, date_to=None, group=None):
+    """count_checks() memoized until the next write bumps the data version."""
+    version = get_data_version(db)
+    key = (date_from, date_to, group)
+    hit = _count_cache.get(key)
+    if hit and hit[0] == version:
+        return hit[1]
+    total = count_checks(db, date_from, date_to, group)
+    if len(_count_cache) > 256:
+        _count_cache.clear()
+    _count_cache[key] = (version, total)
+    return total
+
+
+# ============================================================
+# Dashboard data access: latest check per (item, group)
+# ============================================================
+
+CHECK_COLUMNS = ('id', 'item_id', 'group_name', 'checked_by', 'quantity',
+                 'status', 'note', 'check_date', 'created_at')
+
+
+def fetch_latest_checks(db, check_dates, groups):
+    """Return {check_date: {(item_id, group_name): check_dict}} for each requested date.
+    Rows are unique per item+group+date, and dates that fall in the same
+    monthly table share one indexed query."""
+    result = {d: {} for d in check_dates}
+    if not groups:
+        return result
+    dates_by_table = {}
+    for d in check_dates:
+        dates_by_table.setdefault(get_checks_table(d), []).append(d)
+
+    for tbl, dates in dates_by_table.items():
+        if not checks_table_exists(db, tbl):
+            continue
+        date_marks = ', '.join('?' * len(dates))
+        group_marks = ', '.join('?' * len(groups))
+        rows = db.execute(f'''
+            SELECT {', '.join(CHECK_COLUMNS)} FROM "{tbl}"
+            WHERE check_date IN ({date_marks}) AND group_name IN ({group_marks})
+        ''', list(dates) + list(groups)).fetchall()
+        for row in rows:
+            result[row['check_date']][(row['item_id'], row['group_name'])] = dict(row)
+    return result
+
+
+def fetch_latest_orders(db):
+    """Return {item_id: order_info} for the most recent order request of each item.
+    Driven from items via idx_order_requests_item_created, so cost scales with items, not order history."""
+    rows = db.execute('''
+        SELECT o.item_id, o.status, o.quantity_needed, o.requested_by, o.note, o.created_at,
+               o.resolved_by, o.resolved_at, o.ordered_by, o.ordered_at
+        FROM items i
+        JOIN order_requests o ON o.id = (
+            SELECT o2.id FROM order_requests o2
+            WHERE o2.item_id = i.id
+            ORDER BY o2.created_at DESC, o2.id DESC
+            LIMIT 1
+        )
+    ''').fetchall()
+    latest = {}
     for row in rows:
-        name = row['name']
-        if re.match(r'^checks_\d{4}_\d{2}$', name):
-            tables.append(name)
-    return sorted(tables)
+        latest[row['item_id']] = {
+            'status': row['status'],
+            'date': row['created_at'][:10] if row['created_at'] else '',
+            'quantity': row['quantity_needed'],
+            'requested_by': row['requested_by'],
+            'note': row['note'],
+            'resolved_by': row['resolved_by'],
+            'resolved_at': row['resolved_at'][:10] if row['resolved_at'] else '',
+            'ordered_by': row['ordered_by'],
+            'ordered_at': row['ordered_at'][:10] if row['ordered_at'] else '',
+        }
+    return latest
+
+
+# ============================================================
+# Group check summary (last checked per group, maintained on write)
+# ============================================================
+
+def record_group_submission(db, group_name, check_date, checked_by, item_count, ts):
+    """Upsert the summary row after a submission. Older dates never overwrite newer ones."""
+    db.execute('''
+        INSERT INTO group_check_summary (group_name, last_check_date, last_checked_by, item_count, updated_at)
+        VALUES (?, ?, ?, ?, ?)
+        ON CONFLICT(group_name) DO UPDATE SET
+            last_check_date = excluded.last_check_date,
+            last_checked_by = excluded.last_checked_by,
+            item_count = excluded.item_count,
+            updated_at = excluded.updated_at
+        WHERE excluded.last_check_date >= group_check_summary.last_check_date
+    ''', (group_name, check_date, checked_by, item_count, ts))
+
+
+def refresh_group_summary(db, group_names):
+    """Recompute summary rows for the given groups from the monthly tables (newest month first)."""
+    tables = sorted(get_all_checks_tables(db), reverse=True)
+    for group in group_names:
+        db.execute('DELETE FROM group_check_summary WHERE group_name = ?', (group,))
+        for tbl in tables:
+            row = db.execute(f'SELECT MAX(check_date) AS last_date FROM "{tbl}" WHERE group_name = ?',
+                             (group,)).fetchone()
+            if not row or not row['last_date']:
+                continue
+            last_date = row['last_date']
+            latest = db.execute(f'''
+                SELECT checked_by, created_at,
+                       (SELECT COUNT(*) FROM "{tbl}"
+                        WHERE group_name = ? AND check_date = ?) AS item_count
+                FROM "{tbl}" WHERE group_name = ? AND check_date = ?
+                ORDER BY id DESC LIMIT 1
+            ''', (group, last_date, group, last_date)).fetchone()
+            record_group_submission(db, group, last_date, latest['checked_by'],
+                                    latest['item_count'], latest['created_at'])
+            break
+
+
+def rebuild_group_summary(db):
+    """Rebuild group_check_summary from scratch for every group found in the monthly tables."""
+    tables = get_all_checks_tables(db)
+    groups = set()
+    for tbl in tables:
+        groups.update(r['group_name'] for r in db.execute(f'SELECT DISTINCT group_name FROM "{tbl}"'))
+    db.execute('DELETE FROM group_check_summary')
+    refresh_group_summary(db, sorted(groups))
+    return len(groups)
+
+
+@app.cli.command('rebuild-summary')
+def rebuild_summary_command():
+    """Rebuild the last-checked-per-group summary table."""
+    db = sqlite3.connect(DB_PATH)
+    db.row_factory = sqlite3.Row
+    count = rebuild_group_summary(db)
+    db.commit()
+    db.close()
+    print(f'Rebuilt check summary for {count} groups.')
 
 
 # ============================================================
@@ -290,6 +985,59 @@ def init_db():
             used INTEGER NOT NULL DEFAULT 0,
             FOREIGN KEY (user_id) REFERENCES users(id) ON DELETE CASCADE
         );
+
+        CREATE TABLE IF NOT EXISTS app_meta (
+            key TEXT PRIMARY KEY,
+            value INTEGER NOT NULL DEFAULT 0
+        );
+
+        CREATE TABLE IF NOT EXISTS group_check_summary (
+            group_name TEXT PRIMARY KEY,
+            last_check_date TEXT NOT NULL DEFAULT '',
+            last_checked_by TEXT NOT NULL DEFAULT '',
+            item_count INTEGER NOT NULL DEFAULT 0,
+            updated_at TEXT NOT NULL DEFAULT ''
+        );
+
+        CREATE TABLE IF NOT EXISTS change_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            version INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            item_id INTEGER,
+            group_name TEXT,
+            check_date TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_change_log_version ON change_log(version);
+
+        CREATE TABLE IF NOT EXISTS email_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            to_email TEXT NOT NULL,
+            subject TEXT NOT NULL,
+            html TEXT NOT NULL,
+            status TEXT NOT NULL DEFAULT 'pending',
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at INTEGER NOT NULL DEFAULT 0,
+            last_error TEXT NOT NULL DEFAULT '',
+            created_at TEXT NOT NULL DEFAULT '',
+            sent_at TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS idx_email_outbox_due ON email_outbox(status, next_attempt_at);
+
+        CREATE TABLE IF NOT EXISTS notification_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            duty_date TEXT NOT NULL,
+            group_name TEXT NOT NULL DEFAULT '',
+            email TEXT NOT NULL,
+            display_name TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL,
+            error TEXT NOT NULL DEFAULT '',
+            attempts INTEGER NOT NULL DEFAULT 1,
+            elapsed_ms INTEGER NOT NULL DEFAULT 0,
+            notified_at TEXT NOT NULL DEFAULT '',
+            outbox_id INTEGER,
+            UNIQUE(kind, duty_date, email)
+        );
     ''')
 
     # ---- Schema migrations ----
@@ -314,6 +1062,21 @@ def init_db():
     if 'ordered_at' not in or_cols:
         db.execute("ALTER TABLE order_requests ADD COLUMN ordered_at TEXT NOT NULL DEFAULT ''")
 
+    # Link reminder rows to the email_outbox row that carries them
+    nl_cols = [c['name'] for c in db.execute("PRAGMA table_info(notification_log)").fetchall()]
+    if 'outbox_id' not in nl_cols:
+        db.execute("ALTER TABLE notification_log ADD COLUMN outbox_id INTEGER")
+    db.execute('CREATE INDEX IF NOT EXISTS idx_notification_log_outbox ON notification_log(outbox_id)')
+
+    # Versions bumped before change_log existed have no entries to replay
+    db.execute('''
+        INSERT OR IGNORE INTO app_meta (key, value)
+        SELECT 'change_log_floor', COALESCE((SELECT value FROM app_meta WHERE key = 'data_version'), 0)
+    ''')
+
+    # Index for "latest order per item" lookups on the dashboard
+    db.execute('CREATE INDEX IF NOT EXISTS idx_order_requests_item_created ON order_requests(item_id, created_at)')
+
     # Populate min_value/min_unit from minimum text where not set
     items_to_parse = db.execute("SELECT id, minimum FROM items WHERE min_value IS NULL AND minimum != ''").fetchall()
     for item in items_to_parse:
@@ -348,17 +1111,26 @@ def init_db():
             ensure_checks_table(db, table_name)
             # Copy data
             db.execute(f'''
-                INSERT INTO "{table_name}" (id, item_id, group_name, checked_by, quantity, status, note, check_date, created_at)
+                INSERT OR REPLACE INTO "{table_name}" (id, item_id, group_name, checked_by, quantity, status, note, check_date, created_at)
                 SELECT id, item_id, group_name, checked_by, quantity, status, note, check_date,
                        COALESCE(created_at, '') FROM checks WHERE substr(check_date, 1, 7) = ?
+                ORDER BY id
             ''', (ym,))
         # Migrate group names in newly created monthly tables
         for old_name, new_name in name_migrations.items():
             for tbl in get_all_checks_tables(db):
-                db.execute(f'UPDATE "{tbl}" SET group_name = ? WHERE group_name = ?', (new_name, old_name))
+                db.execute(f'UPDATE OR REPLACE "{tbl}" SET group_name = ? WHERE group_name = ?', (new_name, old_name))
         # Rename old table
         db.execute("ALTER TABLE checks RENAME TO checks_legacy")
 
+    # ---- Unique (item, group, date) key on every monthly table ----
+    for tbl in get_all_checks_tables(db):
+        migrate_checks_unique_key(db, tbl)
+
+    # Populate the last-checked summary on first run (or after a manual wipe)
+    if db.execute('SELECT COUNT(*) FROM group_check_summary').fetchone()[0] == 0:
+        rebuild_group_summary(db)
+
     # Create admin if not exists
     existing = db.execute('SELECT id FROM users WHERE username = ?', ('admin',)).fetchone()
     if not existing:
@@ -378,6 +1150,7 @@ def init_db():
             )
 
     db.commit()
+    _checks_tables.load(db)
     db.close()
 
 
@@ -408,6 +1181,45 @@ def admin_required(f):
     return decorated
 
 
+# Changes whenever the code or templates are redeployed, so old ETags never match new markup
+_ETAG_SALT = str(max(
+    [os.path.getmtime(os.path.abspath(__file__))] +
+    [os.path.getmtime(os.path.join(BASE_DIR, 'templates', name))
+     for name in os.listdir(os.path.join(BASE_DIR, 'templates'))]
+))
+
+
+def conditional_get(f):
+    """Answer repeat GETs with 304 Not Modified while nothing has been written.
+    The ETag covers the global data version, the teams config, the viewer (role, group, name),
+    the full URL and today's KST date; pending flash messages bypass it."""
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if request.method != 'GET' or session.get('_flashes'):
+            return f(*args, **kwargs)
+        db = get_db()
+        version = get_data_version(db)
+        bumped_at = get_data_version(db, 'data_version_at')
+        raw = '|'.join(str(part) for part in (
+            _ETAG_SALT, version, get_teams().mtime, session.get('role', ''), session.get('group_name', ''),
+            session.get('display_name', ''), request.full_path, today_kst().isoformat()))
+        etag = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+        last_modified = datetime.fromtimestamp(bumped_at, timezone.utc) if bumped_at else None
+
+        if not is_resource_modified(request.environ, etag=etag, last_modified=last_modified):
+            resp = Response(status=304)
+        else:
+            resp = make_response(f(*args, **kwargs))
+            if resp.status_code != 200:
+                return resp
+        resp.set_etag(etag)
+        if last_modified:
+            resp.last_modified = last_modified
+        resp.headers['Cache-Control'] = 'private, no-cache'
+        return resp
+    return decorated
+
+
 def parse_number(text):
     """Extract leading number from quantity text like '3 bottles' -> 3.0"""
     if not text:
@@ -463,34 +1275,19 @@ def compute_status(quantity_val, min_value):
 # ============================================================
 
 def get_rotation_info(for_date=None):
-    """Return rotation info from teams_config.json.
+    """Return rotation info from the shared rotation calendar (built from teams_config.json).
     Returns (duty_group_name, check_date, next_check_date, next_group_name, duty_team_key, next_team_key)."""
-    config = _teams_config
-    teams = {t['key']: t['name'] for t in config['teams']}
-    order = config['rotation_order']
-    start = date.fromisoformat(config['rotation_start'])
-    interval = config['rotation_interval_days']
-
     if for_date is None:
         for_date = today_kst()
-    if isinstance(for_date, str):
-        for_date = date.fromisoformat(for_date)
-
-    days_since = (for_date - start).days
-    if days_since < 0:
-        first_key = order[0]
-        return teams[first_key], start.isoformat(), None, None, first_key, None
+    return get_teams().rotation.info(for_date)
 
-    period = days_since // interval
-    key_idx = period % len(order)
-    check_date = start + timedelta(days=period * interval)
-    next_period = period + 1
-    next_key_idx = next_period % len(order)
-    next_check_date = start + timedelta(days=next_period * interval)
 
-    return (teams[order[key_idx]], check_date.isoformat(),
-            next_check_date.isoformat(), teams[order[next_key_idx]],
-            order[key_idx], order[next_key_idx])
+@app.cli.command('duty-calendar')
+@click.argument('count', default=10)
+def duty_calendar_command(count):
+    """Print the next COUNT duty days and their teams."""
+    for day in get_teams().rotation.upcoming(today_kst(), count):
+        print(f'{day.date}  Team {day.team_key} ({day.group})')
 
 
 # ============================================================
@@ -505,7 +1302,7 @@ def inject_globals():
         'current_user': session.get('display_name', ''),
         'current_role': session.get('role', ''),
         'current_group': session.get('group_name', ''),
-        'groups': GROUPS,
+        'groups': get_groups(),
         'teams_display': teams_display,
         'get_team_key': get_team_key_for_group,
         'now_kst': kst_now.strftime('%H:%M:%S'),
@@ -543,6 +1340,343 @@ def login():
     return render_template('login.html')
 
 
+# ============================================================
+# Outbound email queue (email_outbox table, sent off the request path)
+# ============================================================
+
+OUTBOX_BATCH_SIZE = 20
+OUTBOX_MAX_ATTEMPTS = 6
+OUTBOX_POLL_SECONDS = 30
+# Rows left in 'sending' this long (worker died mid-batch) go back to the queue
+OUTBOX_CLAIM_TIMEOUT = 600
+# Off by default: PythonAnywhere's uWSGI workers do not run app threads. Without the
+# worker, mail queued during a request is sent once its response has gone out, and
+# `flask drain-outbox` on a schedule retries the rest. Set OUTBOX_WORKER=1 on hosts with threads.
+OUTBOX_WORKER_ENABLED = os.environ.get('OUTBOX_WORKER', '0') == '1'
+
+
+def enqueue_email(db, to_email, subject, html):
+    """Queue an email inside the caller's transaction; call wake_outbox() after commit.
+    Returns the outbox row id."""
+    cur = db.execute(
+        'INSERT INTO email_outbox (to_email, subject, html, created_at) VALUES (?, ?, ?, ?)',
+        (to_email, subject, html, now_kst())
+    )
+    return cur.lastrowid
+
+
+def outbox_backoff(attempts):
+    """Seconds to wait before retry number `attempts`: 1, 2, 4, ... minutes, capped at an hour."""
+    return min(60 * 2 ** (attempts - 1), 3600)
+
+
+def drain_outbox(db, batch_size=OUTBOX_BATCH_SIZE):
+    """Send due queued emails in batches over one SMTP connection until none are due.
+    Failed sends are retried with exponential backoff, then marked 'failed'. The final
+    outcome is copied to any notification_log row linked by outbox_id.
+    Returns (sent, failed) counts for this call."""
+    from email_utils import send_many
+    sent = failed = 0
+    while True:
+        now = int(time.time())
+        db.execute('BEGIN IMMEDIATE')
+        db.execute("UPDATE email_outbox SET status = 'pending' WHERE status = 'sending' AND next_attempt_at < ?",
+                   (now - OUTBOX_CLAIM_TIMEOUT,))
+        batch = db.execute('''
+            SELECT id, to_email, subject, html, attempts FROM email_outbox
+            WHERE status = 'pending' AND next_attempt_at <= ?
+            ORDER BY id LIMIT ?
+        ''', (now, batch_size)).fetchall()
+        # Claim the batch so another worker process cannot send it twice
+        db.executemany("UPDATE email_outbox SET status = 'sending', next_attempt_at = ? WHERE id = ?",
+                       [(now, row['id']) for row in batch])
+        db.commit()
+        if not batch:
+            return sent, failed
+
+        results = send_many([(row['to_email'], row['subject'], row['html']) for row in batch])
+        for row, result in zip(batch, results):
+            attempts = row['attempts'] + 1
+            if result is True:
+                status = 'sent'
+                db.execute("UPDATE email_outbox SET status = 'sent', attempts = ?, last_error = '', sent_at = ? WHERE id = ?",
+                           (attempts, now_kst(), row['id']))
+                sent += 1
+            else:
+                status = 'failed' if attempts >= OUTBOX_MAX_ATTEMPTS else 'pending'
+                db.execute('UPDATE email_outbox SET status = ?, attempts = ?, last_error = ?, next_attempt_at = ? WHERE id = ?',
+                           (status, attempts, str(result), int(time.time()) + outbox_backoff(attempts), row['id']))
+                failed += 1
+            if status != 'pending':
+                db.execute('UPDATE notification_log SET status = ?, error = ?, attempts = ?, notified_at = ? WHERE outbox_id = ?',
+                           (status, '' if result is True else str(result), attempts, now_kst(), row['id']))
+        db.commit()
+
+
+class OutboxWorker:
+    """Background thread that drains email_outbox: once on start (picking up
+    retries and stale claims left by a restart), after each enqueue, and every
+    OUTBOX_POLL_SECONDS for retries that came due.
+    Started by the first request in each process (a forked worker starts its own)."""
+
+    def __init__(self, poll_seconds=OUTBOX_POLL_SECONDS):
+        self.poll_seconds = poll_seconds
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def ensure_started(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='email-outbox', daemon=True)
+                self._thread.start()
+
+    def wake(self):
+        self.ensure_started()
+        self._wake.set()
+
+    def _run(self):
+        while True:
+            drain_outbox_pooled()
+            self._wake.wait(self.poll_seconds)
+            self._wake.clear()
+
+
+_outbox_worker = OutboxWorker()
+
+
+def drain_outbox_pooled():
+    """Drain the outbox over a pooled connection, logging (not raising) failures."""
+    path = DB_PATH
+    db = _db_pool.acquire(path)
+    try:
+        drain_outbox(db)
+    except Exception:
+        app.logger.exception('Email outbox drain failed')
+    finally:
+        _db_pool.release(db, path)
+
+
+def wake_outbox():
+    """Get newly queued mail sent: wake the background worker, or without one,
+    drain the outbox once the current response has been sent."""
+    if OUTBOX_WORKER_ENABLED:
+        _outbox_worker.wake()
+    elif has_request_context() and not g.get('_outbox_drain_scheduled'):
+        g._outbox_drain_scheduled = True
+
+        @after_this_request
+        def drain_after_response(response):
+            response.call_on_close(drain_outbox_pooled)
+            return response
+
+
+@app.before_request
+def start_outbox_worker():
+    if OUTBOX_WORKER_ENABLED:
+        _outbox_worker.ensure_started()
+
+
+@app.cli.command('drain-outbox')
+def drain_outbox_command():
+    """Send all queued emails that are due."""
+    db = sqlite3.connect(DB_PATH)
+    db.row_factory = sqlite3.Row
+    sent, failed = drain_outbox(db)
+    db.close()
+    print(f'Outbox drained: {sent} sent, {failed} failed.')
+
+
+# ============================================================
+# Duty reminder scheduler (rules from teams_config.json "reminders")
+# ============================================================
+
+DUTY_SCHEDULER_TICK_SECONDS = 60
+# Off by default (PythonAnywhere's workers do not run app threads): schedule `flask send-reminders`
+# hourly instead, or keep send_duty_alert.py for the 09:00 reminder only. Set DUTY_SCHEDULER=1 on hosts
+# with threads; its 'duty_reminder' then replaces send_duty_alert.py, so drop that task
+DUTY_SCHEDULER_ENABLED = os.environ.get('DUTY_SCHEDULER', '0') == '1'
+
+REMINDER_MESSAGES = {
+    'day_before': ('Stock Check Tomorrow',
+                   'Tomorrow (<strong>{date}</strong>) is your group\'s stock check day.'),
+    'duty_reminder': ('Stock Check Duty Reminder',
+                      'Today (<strong>{date}</strong>) is your group\'s stock check day.'),
+    'overdue': ('Stock Check Not Submitted Yet',
+                'No stock check has been submitted for your group today (<strong>{date}</strong>) yet.'),
+}
+
+
+def group_has_submitted(db, group_name, check_date):
+    """True if any check row exists for the group on `check_date`."""
+    table_name = get_checks_table(check_date)
+    if not checks_table_exists(db, table_name):
+        return False
+    return db.execute(f'SELECT 1 FROM "{table_name}" WHERE group_name = ? AND check_date = ? LIMIT 1',
+                      (group_name, check_date)).fetchone() is not None
+
+
+def pending_dashboard_reminder(db, group_name, duty_date):
+    """Title of the latest dashboard reminder queued for the group's `duty_date`,
+    or None if there is none or the group has submitted since."""
+    kinds = [rule.kind for rule in get_teams().reminders if 'dashboard' in rule.channels]
+    if not kinds or not group_name:
+        return None
+    row = db.execute(f"""
+        SELECT kind FROM notification_log
+        WHERE email = '' AND group_name = ? AND duty_date = ? AND kind IN ({','.join('?' * len(kinds))})
+        ORDER BY id DESC LIMIT 1
+    """, (group_name, duty_date, *kinds)).fetchone()
+    if row is None or group_has_submitted(db, group_name, duty_date):
+        return None
+    return REMINDER_MESSAGES.get(row['kind'], REMINDER_MESSAGES['duty_reminder'])[0]
+
+
+def _reminder_html(rule, member, team, duty_date):
+    title, line = REMINDER_MESSAGES.get(rule.kind, REMINDER_MESSAGES['duty_reminder'])
+    return title, f"""
+    <div style="font-family: sans-serif; max-width: 500px; margin: auto; padding: 20px;">
+        <h2 style="color: #1a237e;">{title}</h2>
+        <p>Hello <strong>{member['display_name']}</strong>,</p>
+        <p>{line.format(date=duty_date)}</p>
+        <p>Group: <strong>Team {team['key']} ({team['name']})</strong></p>
+        <p>Please log in and submit your stock check at your earliest convenience.</p>
+        <hr style="border: none; border-top: 1px solid #ddd;">
+        <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
+    </div>
+    """
+
+
+def queue_reminder(db, rule, team, duty_date):
+    """Queue one rule's reminder for the duty group, at most once per (kind, group, date).
+    The group-level notification_log row (email '') is the claim; member rows record who
+    was queued and end as 'sent' or 'failed' once the outbox finishes with their email. A dashboard reminder also bumps the data version so cached dashboards
+    re-render with the notice. Returns the number of emails queued, or None if it was already claimed."""
+    claimed = db.execute("SELECT 1 FROM notification_log WHERE kind = ? AND duty_date = ? AND email = ''",
+                         (rule.kind, duty_date)).fetchone()
+    if claimed:
+        return None
+    if rule.only_if_unsubmitted and group_has_submitted(db, team['name'], duty_date):
+        return None
+
+    members = db.execute(
+        "SELECT display_name, email FROM users WHERE group_name = ? AND email_verified = 1 AND email IS NOT NULL AND email != ''",
+        (team['name'],)
+    ).fetchall() if 'email' in rule.channels else []
+    ts = now_kst()
+    db.execute('BEGIN IMMEDIATE')
+    cur = db.execute(
+        "INSERT OR IGNORE INTO notification_log (kind, duty_date, group_name, email, status, notified_at) VALUES (?, ?, ?, '', 'queued', ?)",
+        (rule.kind, duty_date, team['name'], ts))
+    if not cur.rowcount:
+        db.rollback()  # Another worker claimed it first
+        return None
+    if 'dashboard' in rule.channels:
+        bump_data_version(db)
+    queued = skipped = 0
+    for member in members:
+        cur = db.execute(
+            "INSERT OR IGNORE INTO notification_log (kind, duty_date, group_name, email, display_name, status, notified_at) VALUES (?, ?, ?, ?, ?, 'queued', ?)",
+            (rule.kind, duty_date, team['name'], member['email'], member['display_name'], ts))
+        if cur.rowcount:
+            log_id = cur.lastrowid
+            title, html = _reminder_html(rule, member, team, duty_date)
+            outbox_id = enqueue_email(db, member['email'], f'[Nano Lab] {title} - {duty_date}', html)
+            db.execute('UPDATE notification_log SET outbox_id = ? WHERE id = ?', (outbox_id, log_id))
+            queued += 1
+        else:
+            skipped += 1  # Already claimed by send_duty_alert.py
+    db.commit()
+    if skipped:
+        app.logger.warning('%s for %s: %d members already notified by send_duty_alert.py; '
+                           'schedule only one of it and the reminder scheduler',
+                           rule.kind, duty_date, skipped)
+
+    if queued:
+        wake_outbox()
+    if 'dashboard' in rule.channels:
+        title = REMINDER_MESSAGES.get(rule.kind, REMINDER_MESSAGES['duty_reminder'])[0]
+        _change_broker.publish('reminder', {'version': get_data_version(db), 'kind': rule.kind,
+                                            'check_date': duty_date, 'group': team['name'],
+                                            'team_key': team['key'], 'title': title})
+    return queued
+
+
+def run_due_reminders(db, now=None):
+    """Queue every reminder rule whose time has passed today (KST) and that has not run yet.
+    Returns [(kind, duty_date, group_name, emails_queued)] for the reminders queued by this call."""
+    now = now or datetime.now(KST)
+    teams = get_teams()
+    done = []
+    for rule in teams.reminders:
+        duty_date = now.date() - timedelta(days=rule.offset_days)
+        if now.time() < rule.at or not teams.rotation.is_duty_day(duty_date):
+            continue
+        team = teams.rotation.duty_team(duty_date)
+        queued = queue_reminder(db, rule, team, duty_date.isoformat())
+        if queued is not None:
+            done.append((rule.kind, duty_date.isoformat(), team['name'], queued))
+    return done
+
+
+class DutyScheduler:
+    """Background thread that checks the reminder rules every tick.
+    Started by the first request in each process; several processes may run one,
+    since queue_reminder() claims each reminder in the database."""
+
+    def __init__(self, tick_seconds=DUTY_SCHEDULER_TICK_SECONDS):
+        self.tick_seconds = tick_seconds
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def ensure_started(self):
+        if self._pid == os.getpid() and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or self._pid != os.getpid() or not self._thread.is_alive():
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run, name='duty-scheduler', daemon=True)
+                self._thread.start()
+
+    def _run(self):
+        while True:
+            path = DB_PATH
+            db = _db_pool.acquire(path)
+            try:
+                run_due_reminders(db)
+            except Exception:
+                app.logger.exception('Duty reminder run failed')
+            finally:
+                _db_pool.release(db, path)
+            time.sleep(self.tick_seconds)
+
+
+_duty_scheduler = DutyScheduler()
+
+
+@app.before_request
+def start_duty_scheduler():
+    if DUTY_SCHEDULER_ENABLED:
+        _duty_scheduler.ensure_started()
+
+
+@app.cli.command('send-reminders')
+def send_reminders_command():
+    """Queue due duty reminders and send them (for hosts without background threads)."""
+    db = sqlite3.connect(DB_PATH)
+    db.row_factory = sqlite3.Row
+    for kind, duty_date, group_name, queued in run_due_reminders(db):
+        print(f'{kind} for {group_name} ({duty_date}): {queued} emails queued')
+    sent, failed = drain_outbox(db)
+    db.close()
+    print(f'Outbox drained: {sent} sent, {failed} failed.')
+
+
 # ============================================================
 # Item 10: Registration with email + verification + password reset
 # ============================================================
@@ -580,8 +1714,9 @@ def register():
                 "INSERT INTO email_tokens (user_id, email, token, token_type, created_at) VALUES (?, ?, ?, ?, ?)",
                 (user['id'], email, token, 'verify', now_kst())
             )
+            _queue_verification_email(db, email, token, display_name)
             db.commit()
-            _send_verification_email(email, token, display_name)
+            wake_outbox()
 
         flash('Registration submitted! Check your email for verification. Admin approval is also required.', 'info')
         return redirect(url_for('login'))
@@ -589,25 +1724,21 @@ def register():
     return render_template('register.html')
 
 
-def _send_verification_email(email, token, display_name):
-    """Try to send verification email. Fail silently if not configured."""
-    try:
-        from email_utils import send_email
-        verify_url = url_for('verify_email', token=token, _external=True)
-        html = f"""
-        <div style="font-family: sans-serif; max-width: 500px; margin: auto; padding: 20px;">
-            <h2 style="color: #1a237e;">Email Verification</h2>
-            <p>Hello <strong>{display_name}</strong>,</p>
-            <p>Please verify your email address by clicking the link below:</p>
-            <p><a href="{verify_url}" style="background: #1a237e; color: white; padding: 10px 24px; border-radius: 6px; text-decoration: none; display: inline-block;">Verify Email</a></p>
-            <p style="font-size: 12px; color: #888;">If the button doesn't work, copy and paste this URL:<br>{verify_url}</p>
-            <hr style="border: none; border-top: 1px solid #ddd;">
-            <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
-        </div>
-        """
-        send_email(email, 'Nano Lab Stock Check - Verify Your Email', html)
-    except Exception:
-        pass
+def _queue_verification_email(db, email, token, display_name):
+    """Queue the verification email; the outbox worker sends it."""
+    verify_url = url_for('verify_email', token=token, _external=True)
+    html = f"""
+    <div style="font-family: sans-serif; max-width: 500px; margin: auto; padding: 20px;">
+        <h2 style="color: #1a237e;">Email Verification</h2>
+        <p>Hello <strong>{display_name}</strong>,</p>
+        <p>Please verify your email address by clicking the link below:</p>
+        <p><a href="{verify_url}" style="background: #1a237e; color: white; padding: 10px 24px; border-radius: 6px; text-decoration: none; display: inline-block;">Verify Email</a></p>
+        <p style="font-size: 12px; color: #888;">If the button doesn't work, copy and paste this URL:<br>{verify_url}</p>
+        <hr style="border: none; border-top: 1px solid #ddd;">
+        <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
+    </div>
+    """
+    enqueue_email(db, email, 'Nano Lab Stock Check - Verify Your Email', html)
 
 
 @app.route('/verify_email/<token>')
@@ -645,8 +1776,9 @@ def forgot_password():
                 "INSERT INTO email_tokens (user_id, email, token, token_type, created_at) VALUES (?, ?, ?, ?, ?)",
                 (user['id'], email, token, 'reset', now_kst())
             )
+            _queue_reset_email(db, email, token, user['display_name'])
             db.commit()
-            _send_reset_email(email, token, user['display_name'])
+            wake_outbox()
 
         # Always show the same message to prevent email enumeration
         flash('If an account with that email exists, a password reset link has been sent.', 'info')
@@ -655,25 +1787,21 @@ def forgot_password():
     return render_template('forgot_password.html')
 
 
-def _send_reset_email(email, token, display_name):
-    """Try to send password reset email. Fail silently if not configured."""
-    try:
-        from email_utils import send_email
-        reset_url = url_for('reset_password_token', token=token, _external=True)
-        html = f"""
-        <div style="font-family: sans-serif; max-width: 500px; margin: auto; padding: 20px;">
-            <h2 style="color: #c62828;">Password Reset</h2>
-            <p>Hello <strong>{display_name}</strong>,</p>
-            <p>Click the link below to reset your password. This link expires in 1 hour.</p>
-            <p><a href="{reset_url}" style="background: #c62828; color: white; padding: 10px 24px; border-radius: 6px; text-decoration: none; display: inline-block;">Reset Password</a></p>
-            <p style="font-size: 12px; color: #888;">If you didn't request this, ignore this email.</p>
-            <hr style="border: none; border-top: 1px solid #ddd;">
-            <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
-        </div>
-        """
-        send_email(email, 'Nano Lab Stock Check - Password Reset', html)
-    except Exception:
-        pass
+def _queue_reset_email(db, email, token, display_name):
+    """Queue the password reset email; the outbox worker sends it."""
+    reset_url = url_for('reset_password_token', token=token, _external=True)
+    html = f"""
+    <div style="font-family: sans-serif; max-width: 500px; margin: auto; padding: 20px;">
+        <h2 style="color: #c62828;">Password Reset</h2>
+        <p>Hello <strong>{display_name}</strong>,</p>
+        <p>Click the link below to reset your password. This link expires in 1 hour.</p>
+        <p><a href="{reset_url}" style="background: #c62828; color: white; padding: 10px 24px; border-radius: 6px; text-decoration: none; display: inline-block;">Reset Password</a></p>
+        <p style="font-size: 12px; color: #888;">If you didn't request this, ignore this email.</p>
+        <hr style="border: none; border-top: 1px solid #ddd;">
+        <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
+    </div>
+    """
+    enqueue_email(db, email, 'Nano Lab Stock Check - Password Reset', html)
 
 
 @app.route('/reset_password_token/<token>', methods=['GET', 'POST'])
@@ -717,70 +1845,156 @@ def logout():
 
 
 # ============================================================
-# Routes: Dashboard
+# Live change feed (in-process pub/sub behind /api/events)
 # ============================================================
 
-@app.route('/')
+class ChangeBroker:
+    """Fan change events out to every open event stream in this process.
+    Each subscriber gets a bounded queue; one that falls behind is reset to a
+    single 'resync' event so it reloads the full state instead of blocking writers.
+    No external broker: with several worker processes each one only sees its own writes."""
+
+    def __init__(self, max_queued=100, max_subscribers=None):
+        self.max_queued = max_queued
+        self.max_subscribers = max_subscribers
+        self._lock = threading.Lock()
+        self._subscribers = set()
+
+    def subscribe(self):
+        """New subscriber queue, or None when `max_subscribers` streams are already open."""
+        q = queue.Queue(maxsize=self.max_queued)
+        with self._lock:
+            if self.max_subscribers is not None and len(self._subscribers) >= self.max_subscribers:
+                return None
+            self._subscribers.add(q)
+        return q
+
+    def unsubscribe(self, q):
+        with self._lock:
+            self._subscribers.discard(q)
+
+    def publish(self, kind, payload):
+        """Queue an event for every subscriber (call after the write has committed)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+        for q in subscribers:
+            try:
+                q.put_nowait((kind, payload))
+            except queue.Full:
+                with q.mutex:
+                    q.queue.clear()
+                q.put_nowait(('resync', {}))
+
+    def subscriber_count(self):
+        with self._lock:
+            return len(self._subscribers)
+
+
+# Each open stream holds a worker for its whole lifetime, so the feed is opt-in:
+# on single-threaded workers (PythonAnywhere's uWSGI) one open dashboard tab would
+# take a whole worker. Set LIVE_FEED=1 only behind a threaded or async server.
+# Streams are capped per process and closed after EVENT_STREAM_MAX_SECONDS; the
+# browser's EventSource reconnects on its own after the 'retry' delay.
+LIVE_FEED_ENABLED = os.environ.get('LIVE_FEED', '0') == '1'
+EVENT_STREAM_MAX_SUBSCRIBERS = int(os.environ.get('LIVE_FEED_MAX_STREAMS', '8'))
+EVENT_STREAM_MAX_SECONDS = 300
+EVENT_STREAM_RETRY_MS = 5000
+
+_change_broker = ChangeBroker(max_subscribers=EVENT_STREAM_MAX_SUBSCRIBERS)
+
+# Comment line sent while idle so proxies keep the stream open
+EVENT_KEEPALIVE_SECONDS = 25
+
+
+@app.route('/api/events')
 @login_required
-def dashboard():
-    db = get_db()
-    items = db.execute('SELECT * FROM items ORDER BY sort_order').fetchall()
-    check_date = request.args.get('date', today_kst().isoformat())
-
-    # Compute rotation info BEFORE data query so we can look up the duty date
-    rotation_info = get_rotation_info(check_date)
-    rotation_group = rotation_info[0]
-    rotation_check_date = rotation_info[1]
-    next_check_date = rotation_info[2]
-    next_group = rotation_info[3]
-    duty_team_key = rotation_info[4]
-    next_team_key = rotation_info[5]
-
-    # Use the duty date for data lookup (shows duty period records for non-duty dates)
-    display_date = rotation_check_date
+def event_stream():
+    """Server-Sent Events feed of check submissions ('check') and order changes ('order').
+    Event ids are data versions; a client reconnecting with an older Last-Event-ID
+    gets a 'resync' first, and can catch up with /api/dashboard?since=<last id>.
+    Answers 204 (client stops reconnecting) when the feed is disabled and 503 when
+    this process already has its maximum of streams."""
+    if not LIVE_FEED_ENABLED:
+        return '', 204
+    version = int(get_data_version(get_db()))
+    q = _change_broker.subscribe()
+    if q is None:
+        resp = Response('Too many open event streams.', status=503, mimetype='text/plain')
+        resp.headers['Retry-After'] = str(EVENT_STREAM_RETRY_MS // 1000)
+        return resp
+    last_id = request.headers.get('Last-Event-ID', '')
+    if last_id.isdigit() and int(last_id) < version:
+        q.put_nowait(('resync', {'version': version}))
+
+    def generate():
+        try:
+            yield f'id: {version}\nretry: {EVENT_STREAM_RETRY_MS}\n\n'
+            deadline = time.monotonic() + EVENT_STREAM_MAX_SECONDS
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return
+                try:
+                    kind, payload = q.get(timeout=min(EVENT_KEEPALIVE_SECONDS, remaining))
+                except queue.Empty:
+                    yield ': keepalive\n\n'
+                    continue
+                event_id = f"id: {payload['version']}\n" if 'version' in payload else ''
+                yield f'{event_id}event: {kind}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n'
+        finally:
+            _change_broker.unsubscribe(q)
+
+    resp = Response(generate(), mimetype='text/event-stream')
+    resp.headers['Cache-Control'] = 'no-cache'
+    resp.headers['X-Accel-Buffering'] = 'no'
+    return resp
 
-    # Item 6: Use monthly table
-    table_name = get_checks_table(display_date)
-    ensure_checks_table(db, table_name)
 
-    # Get only ONE record per item+group for the duty date (the latest)
-    latest_checks = {}
-    for group in GROUPS:
-        rows = db.execute(f'''
-            SELECT c.* FROM "{table_name}" c
-            INNER JOIN (
-                SELECT item_id, MAX(id) as max_id
-                FROM "{table_name}"
-                WHERE group_name = ? AND check_date = ?
-                GROUP BY item_id
-            ) latest ON c.id = latest.max_id
-        ''', (group, display_date)).fetchall()
-        for row in rows:
-            key = (row['item_id'], group)
-            latest_checks[key] = dict(row)
+# ============================================================
+# Routes: Dashboard
+# ============================================================
 
-    # Get latest order request per item (any status) with full detail
-    pending_orders = {}
-    order_rows = db.execute(
-        "SELECT item_id, status, quantity_needed, requested_by, note, created_at, resolved_by, resolved_at, ordered_by, ordered_at FROM order_requests ORDER BY created_at DESC"
-    ).fetchall()
-    for row in order_rows:
-        if row['item_id'] not in pending_orders:
-            pending_orders[row['item_id']] = {
-                'status': row['status'],
-                'date': row['created_at'][:10] if row['created_at'] else '',
-                'quantity': row['quantity_needed'],
-                'requested_by': row['requested_by'],
-                'note': row['note'],
-                'resolved_by': row['resolved_by'],
-                'resolved_at': row['resolved_at'][:10] if row['resolved_at'] else '',
-                'ordered_by': row['ordered_by'],
-                'ordered_at': row['ordered_at'][:10] if row['ordered_at'] else '',
-            }
-
-    # Summary stats
+class FragmentCache:
+    """Rendered template fragments keyed by view state.
+    Entries are only valid for the data version they were rendered at;
+    the first lookup at a newer version drops everything older."""
+
+    def __init__(self, max_entries=128):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._version = None
+        self._entries = {}
+
+    def get(self, key, version):
+        with self._lock:
+            if version != self._version:
+                self._entries = {}
+                self._version = version
+                return None
+            return self._entries.get(key)
+
+    def set(self, key, version, value):
+        with self._lock:
+            if version != self._version:
+                return
+            if len(self._entries) >= self.max_entries:
+                self._entries.pop(next(iter(self._entries)))
+            self._entries[key] = value
+
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+            self._version = None
+
+
+_dashboard_fragments = FragmentCache()
+# Rendered fragments embed team names and the rotation, so a config reload invalidates them
+_teams_provider.on_reload(lambda snapshot: _dashboard_fragments.clear())
+
+
+def compute_dashboard_summary(latest_checks, pending_orders, total_items):
+    """Status and order counts shown in the dashboard summary bar."""
     summary = {'ok': 0, 'low': 0, 'empty': 0, 'unchecked': 0, 'groups_checked': 0, 'pending_orders': 0, 'ordered': 0}
-    total_items = db.execute('SELECT COUNT(*) FROM items').fetchone()[0]
     groups_with_data = set()
     for key, check in latest_checks.items():
         groups_with_data.add(key[1])
@@ -797,94 +2011,367 @@ def dashboard():
             summary['pending_orders'] += 1
         elif oinfo['status'] == 'ordered':
             summary['ordered'] += 1
+    return summary
 
-    # Get last checked date per group (scan all monthly tables)
-    last_checked = {}
-    all_tables = get_all_checks_tables(db)
-    for group in GROUPS:
-        best = None
-        for tbl in all_tables:
-            row = db.execute(f'SELECT MAX(check_date) as last_date FROM "{tbl}" WHERE group_name = ?', (group,)).fetchone()
-            if row and row['last_date']:
-                if best is None or row['last_date'] > best:
-                    best = row['last_date']
-        last_checked[group] = best
-
-    # Previous duty day records
-    interval_days = _teams_config['rotation_interval_days']
-    prev_date_obj = date.fromisoformat(rotation_check_date) - timedelta(days=interval_days)
-    prev_duty_date = prev_date_obj.isoformat()
+
+def get_dashboard_view(check_date):
+    """Rotation dates and the viewer's edit rights for the dashboard at `check_date`."""
+    # Compute rotation info BEFORE data query so we can look up the duty date
+    rotation_info = get_rotation_info(check_date)
+    rotation_group = rotation_info[0]
+    rotation_check_date = rotation_info[1]
+
+    # Previous duty day (same interval back from the current duty date)
+    prev_duty_date = get_teams().rotation.previous_check_date(rotation_check_date)
     prev_rot = get_rotation_info(prev_duty_date)
-    prev_duty_group = prev_rot[0]
-    prev_duty_team_key = prev_rot[4]
-
-    prev_checks = {}
-    prev_table = get_checks_table(prev_duty_date)
-    if prev_table in get_all_checks_tables(db):
-        for group in GROUPS:
-            rows = db.execute(f'''
-                SELECT c.* FROM "{prev_table}" c
-                INNER JOIN (
-                    SELECT item_id, MAX(id) as max_id
-                    FROM "{prev_table}"
-                    WHERE group_name = ? AND check_date = ?
-                    GROUP BY item_id
-                ) latest ON c.id = latest.max_id
-            ''', (group, prev_duty_date)).fetchall()
-            for row in rows:
-                key = (row['item_id'], group)
-                prev_checks[key] = dict(row)
 
-    # Organize items by stock_place
-    places = []
-    current_place = None
-    current_items = []
-    for item in items:
-        if item['stock_place'] != current_place:
-            if current_place is not None:
-                places.append((current_place, current_items))
-            current_place = item['stock_place']
-            current_items = []
-        current_items.append(dict(item))
-    if current_place is not None:
-        places.append((current_place, current_items))
+    today = today_kst().isoformat()
+    role = session.get('role', '')
+    user_group = session.get('group_name', '')
+    can_edit = (role == 'admin' or (
+        today == rotation_check_date and
+        user_group == rotation_group and
+        check_date == today
+    ))
+    can_edit_drlee = (role == 'admin' or (
+        has_tips_access(user_group) and
+        today == rotation_check_date and
+        check_date == today
+    ))
+    return {
+        'check_date': check_date,
+        # Use the duty date for data lookup (shows duty period records for non-duty dates)
+        'display_date': rotation_check_date,
+        'today': today,
+        'role': role,
+        'user_group': user_group,
+        'rotation_group': rotation_group,
+        'rotation_check_date': rotation_check_date,
+        'next_check_date': rotation_info[2],
+        'next_group': rotation_info[3],
+        'duty_team_key': rotation_info[4],
+        'next_team_key': rotation_info[5],
+        'prev_duty_date': prev_duty_date,
+        'prev_duty_group': prev_rot[0],
+        'prev_duty_team_key': prev_rot[4],
+        'can_edit': can_edit,
+        'can_edit_drlee': can_edit_drlee,
+    }
+
+
+def fetch_last_checked(db):
+    """Last checked date per group (maintained by submit/delete routes)."""
+    last_checked = {group: None for group in get_groups()}
+    for row in db.execute('SELECT group_name, last_check_date FROM group_check_summary').fetchall():
+        if row['group_name'] in last_checked and row['last_check_date']:
+            last_checked[row['group_name']] = row['last_check_date']
+    return last_checked
+
 
+@app.route('/')
+@login_required
+@conditional_get
+def dashboard():
+    db = get_db()
+    catalog = get_item_catalog(db)
+    view = get_dashboard_view(request.args.get('date', today_kst().isoformat()))
+    display_date = view['display_date']
+    prev_duty_date = view['prev_duty_date']
+    role = view['role']
+    user_group = view['user_group']
+    can_edit = view['can_edit']
+    can_edit_drlee = view['can_edit_drlee']
+
+    # Rendered fragments are reused until a write bumps the data version
+    version = get_data_version(db)
+    groups_key = get_teams().groups
+    grid_key = ('grid', display_date, role, user_group, can_edit, can_edit_drlee, groups_key)
+    prev_key = ('prev', prev_duty_date, groups_key)
+    grid = _dashboard_fragments.get(grid_key, version)
+    prev_html = _dashboard_fragments.get(prev_key, version)
+
+    if grid is None or prev_html is None:
+        # Read path: no DDL here — a month without a table simply has no checks yet
+        checks_by_date = fetch_latest_checks(db, [display_date, prev_duty_date], get_groups())
+        latest_checks = checks_by_date[display_date]
+        prev_checks = checks_by_date[prev_duty_date]
+
+    if grid is None:
+        # Latest order request per item (any status) with full detail
+        pending_orders = fetch_latest_orders(db)
+        summary = compute_dashboard_summary(latest_checks, pending_orders, catalog['count'])
+
+        last_checked = fetch_last_checked(db)
+
+        grid_html = Markup(render_template('_dashboard_grid.html',
+                                           places=catalog['places'],
+                                           latest_checks=latest_checks,
+                                           pending_orders=pending_orders,
+                                           last_checked=last_checked,
+                                           rotation_group=view['rotation_group'],
+                                           can_edit=can_edit,
+                                           can_edit_drlee=can_edit_drlee))
+        grid = (grid_html, summary)
+        _dashboard_fragments.set(grid_key, version, grid)
+
+    if prev_html is None:
+        prev_html = Markup(render_template('_dashboard_prev.html',
+                                           places=catalog['places'],
+                                           prev_checks=prev_checks,
+                                           prev_duty_date=prev_duty_date,
+                                           prev_duty_group=view['prev_duty_group'],
+                                           prev_duty_team_key=view['prev_duty_team_key']))
+        _dashboard_fragments.set(prev_key, version, prev_html)
+
+    grid_html, summary = grid
+    # Reminders are also pushed live, but only to tabs open when they fire
+    duty_date = get_rotation_info(view['today'])[1]
+    reminder_title = pending_dashboard_reminder(db, user_group, duty_date)
+    reminder_notice = (f'{reminder_title} ({duty_date}, Team {get_team_key_for_group(user_group)})'
+                       if reminder_title else None)
     return render_template('dashboard.html',
-                           places=places,
-                           items=items,
-                           latest_checks=latest_checks,
-                           pending_orders=pending_orders,
-                           last_checked=last_checked,
+                           grid_html=grid_html,
+                           prev_html=prev_html,
                            summary=summary,
-                           check_date=check_date,
+                           check_date=view['check_date'],
                            display_date=display_date,
-                           today=today_kst().isoformat(),
-                           rotation_group=rotation_group,
-                           rotation_check_date=rotation_check_date,
-                           next_check_date=next_check_date,
-                           next_group=next_group,
-                           duty_team_key=duty_team_key,
-                           next_team_key=next_team_key,
-                           prev_duty_date=prev_duty_date,
-                           prev_duty_group=prev_duty_group,
-                           prev_duty_team_key=prev_duty_team_key,
-                           prev_checks=prev_checks,
-                           can_edit=(session.get('role') == 'admin' or (
-                               today_kst().isoformat() == rotation_check_date and
-                               session.get('group_name') == rotation_group and
-                               check_date == today_kst().isoformat()
-                           )),
-                           can_edit_drlee=(session.get('role') == 'admin' or (
-                               has_tips_access(session.get('group_name', '')) and
-                               today_kst().isoformat() == rotation_check_date and
-                               check_date == today_kst().isoformat()
-                           )))
+                           today=view['today'],
+                           rotation_group=view['rotation_group'],
+                           rotation_check_date=view['rotation_check_date'],
+                           next_check_date=view['next_check_date'],
+                           next_group=view['next_group'],
+                           duty_team_key=view['duty_team_key'],
+                           next_team_key=view['next_team_key'],
+                           can_edit=can_edit,
+                           can_edit_drlee=can_edit_drlee,
+                           reminder_notice=reminder_notice,
+                           data_version=version,
+                           live_feed=LIVE_FEED_ENABLED)
+
+
+def _check_cell(check):
+    """Compact JSON form of a check: [item_id, team_key, quantity, status, note, checked_by]."""
+    return [check['item_id'], get_team_key_for_group(check['group_name']), check['quantity'],
+            check['status'], check['note'], check['checked_by']]
+
+
+@app.route('/api/dashboard')
+@login_required
+@conditional_get
+def api_dashboard():
+    """Dashboard state as JSON. With ?since=<version> only check cells and orders
+    changed after that version are listed (cleared cells go to `removed`);
+    `full` is true whenever the whole state was sent instead."""
+    db = get_db()
+    catalog = get_item_catalog(db)
+    view = get_dashboard_view(request.args.get('date', today_kst().isoformat()))
+    display_date = view['display_date']
+    # Read before the data so a concurrent write is re-sent on the next poll rather than missed
+    version = get_data_version(db)
+
+    since = request.args.get('since', type=int)
+    changes = changes_since(db, since) if since is not None else None
+    changed_cells, changed_orders = set(), set()
+    for change in changes or []:
+        if change['kind'] == 'catalog' or (
+                change['item_id'] is None and change['check_date'] in (None, display_date)):
+            changes = None
+            break
+        if change['kind'] == 'order':
+            changed_orders.add(change['item_id'])
+        elif change['check_date'] == display_date:
+            changed_cells.add((change['item_id'], change['group_name']))
+
+    latest_checks = fetch_latest_checks(db, [display_date], get_groups())[display_date]
+    latest_orders = fetch_latest_orders(db)
+    full = changes is None
+    if full:
+        changed_cells = set(latest_checks)
+        changed_orders = set(latest_orders)
+
+    return jsonify({
+        'version': version,
+        'full': full,
+        'check_date': view['check_date'],
+        'display_date': display_date,
+        'rotation': {key: view[key] for key in (
+            'rotation_group', 'rotation_check_date', 'next_check_date',
+            'next_group', 'duty_team_key', 'next_team_key')},
+        'can_edit': view['can_edit'],
+        'can_edit_drlee': view['can_edit_drlee'],
+        'checks': [_check_cell(latest_checks[key]) for key in sorted(changed_cells) if key in latest_checks],
+        'removed': [[item_id, get_team_key_for_group(group)]
+                    for item_id, group in sorted(changed_cells) if (item_id, group) not in latest_checks],
+        'orders': {item_id: latest_orders[item_id] for item_id in changed_orders if item_id in latest_orders},
+        'summary': compute_dashboard_summary(latest_checks, latest_orders, catalog['count']),
+        'last_checked': fetch_last_checked(db),
+    })
+
+
+# ============================================================
+# Check writes: upsert a group's rows for a date, touching only changed rows
+# ============================================================
+
+def write_group_checks(db, table_name, group_name, check_date, entries, checked_by, ts):
+    """Make the group's rows for `check_date` match `entries` [(item_id, quantity, status, note)].
+    One executemany upsert on the (item_id, group_name, check_date) key updates
+    only rows whose values changed; items no longer submitted are deleted.
+    Runs inside the caller's transaction. Returns {item_id: previous (quantity, status, note)
+    or None} for the rows that changed."""
+    existing = {row['item_id']: (row['quantity'], row['status'], row['note']) for row in db.execute(
+        f'SELECT item_id, quantity, status, note FROM "{table_name}" WHERE group_name = ? AND check_date = ?',
+        (group_name, check_date))}
+    item_ids = [entry[0] for entry in entries]
+    submitted = set(item_ids)
+    changed = {item_id: values for item_id, values in existing.items() if item_id not in submitted}
+    changed.update((item_id, existing.get(item_id)) for item_id, quantity, status, note in entries
+                   if existing.get(item_id) != (quantity, status, note))
+    db.execute(f'DELETE FROM "{table_name}" WHERE group_name = ? AND check_date = ? '
+               f'AND item_id NOT IN ({", ".join("?" * len(item_ids))})',
+               [group_name, check_date] + item_ids)
+    db.executemany(f'''
+        INSERT INTO "{table_name}" (item_id, group_name, checked_by, quantity, status, note, check_date, created_at)
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ON CONFLICT(item_id, group_name, check_date) DO UPDATE SET
+            checked_by = excluded.checked_by,
+            quantity = excluded.quantity,
+            status = excluded.status,
+            note = excluded.note,
+            created_at = excluded.created_at
+        WHERE quantity IS NOT excluded.quantity
+           OR status IS NOT excluded.status
+           OR note IS NOT excluded.note
+    ''', [(item_id, group_name, checked_by, quantity, status, note, check_date, ts)
+          for item_id, quantity, status, note in entries])
+    return changed
+
+
+# ============================================================
+# Low-stock alerts (post-commit hook of submit_check)
+# ============================================================
+
+LOW_STOCK_STATUSES = ('low', 'empty')
+# Set LOW_STOCK_AUTO_ORDER=1 to open an order request for each newly low/empty item
+LOW_STOCK_AUTO_ORDER = os.environ.get('LOW_STOCK_AUTO_ORDER', '0') == '1'
+LOW_STOCK_REQUESTER = 'System (low stock)'
+
+
+def find_new_low_stock(db, check_date, cells):
+    """Submitted cells that just turned low/empty: the status differs both from what the
+    row held before this submission and from the group's value at the previous duty."""
+    candidates = [c for c in cells if c['status'] in LOW_STOCK_STATUSES and c['status'] != c['old_status']]
+    if not candidates:
+        return []
+    prev_date = get_teams().rotation.previous_check_date(check_date)
+    prev_checks = fetch_latest_checks(db, [prev_date], sorted({c['group'] for c in candidates}))[prev_date]
+    new_low = []
+    for cell in candidates:
+        prev = prev_checks.get((cell['item_id'], cell['group']))
+        if prev is None or prev['status'] != cell['status']:
+            new_low.append(dict(cell, prev_date=prev_date,
+                                prev_quantity=prev['quantity'] if prev else None,
+                                prev_status=prev['status'] if prev else None))
+    return new_low
+
+
+def has_open_order(db, item_id):
+    """True if the item already has a pending or ordered request."""
+    return db.execute(
+        "SELECT id FROM order_requests WHERE item_id = ? AND status IN ('pending', 'ordered')",
+        (item_id,)
+    ).fetchone() is not None
+
+
+def create_low_stock_orders(db, new_low):
+    """Open one order request per newly low/empty item without an open one.
+    Returns [(order_id, item_id)] for the requests created."""
+    created = []
+    for cell in sorted(new_low, key=lambda c: c['status'] != 'empty'):
+        if any(item_id == cell['item_id'] for _, item_id in created) or has_open_order(db, cell['item_id']):
+            continue
+        cur = db.execute(
+            'INSERT INTO order_requests (item_id, requested_by, requested_by_group, quantity_needed, note, created_at) VALUES (?, ?, ?, ?, ?, ?)',
+            (cell['item_id'], LOW_STOCK_REQUESTER, cell['group'], '',
+             f"{cell['status'].capitalize()} in Team {cell['team_key']} check on {cell['check_date']}", now_kst())
+        )
+        created.append((cur.lastrowid, cell['item_id']))
+    return created
+
+
+def queue_low_stock_digest(db, check_date, checked_by, new_low, created_orders):
+    """Queue one digest email per verified admin; returns the number queued."""
+    admins = db.execute(
+        "SELECT display_name, email FROM users WHERE role = 'admin' AND email_verified = 1 AND email IS NOT NULL AND email != ''"
+    ).fetchall()
+    if not admins:
+        return 0
+    by_id = get_item_catalog(db)['by_id']
+    ordered = {item_id for _, item_id in created_orders}
+    rows = ''.join(
+        f"<tr><td>{escape(by_id[c['item_id']]['item_name'] if c['item_id'] in by_id else c['item_id'])}</td>"
+        f"<td>Team {c['team_key']}</td><td>{escape(c['quantity'])}</td><td><strong>{c['status']}</strong></td>"
+        f"<td>{escape(c['prev_quantity']) if c['prev_status'] else '-'} ({c['prev_status'] or 'not checked'})</td>"
+        f"<td>{'order opened' if c['item_id'] in ordered else ''}</td></tr>"
+        for c in new_low)
+    for admin in admins:
+        html = f"""
+        <div style="font-family: sans-serif; max-width: 640px; margin: auto; padding: 20px;">
+            <h2 style="color: #c62828;">Low Stock Alert</h2>
+            <p>Hello <strong>{escape(admin['display_name'])}</strong>,</p>
+            <p>The stock check for <strong>{check_date}</strong> by {escape(checked_by)} found {len(new_low)} newly low or empty item(s):</p>
+            <table cellpadding="4" style="border-collapse: collapse; font-size: 13px;">
+                <tr><th align="left">Item</th><th align="left">Team</th><th align="left">Qty</th><th align="left">Status</th>
+                    <th align="left">Previous duty ({new_low[0]['prev_date']})</th><th></th></tr>
+                {rows}
+            </table>
+            <hr style="border: none; border-top: 1px solid #ddd;">
+            <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
+        </div>
+        """
+        enqueue_email(db, admin['email'], f'[Nano Lab] Low Stock Alert - {check_date}', html)
+    return len(admins)
+
+
+def after_check_submitted(db, check_date, checked_by, cells):
+    """Post-commit hook for submit_check(): digest newly low/empty items to the admins
+    and, with LOW_STOCK_AUTO_ORDER, open order requests for them. Runs in its own
+    transaction; a failure is logged and never affects the committed submission.
+    Returns the number of order requests opened."""
+    if not any(cell['status'] in LOW_STOCK_STATUSES for cell in cells):
+        return 0
+    try:
+        db.execute('BEGIN IMMEDIATE')
+        new_low = find_new_low_stock(db, check_date, cells)
+        if not new_low:
+            db.rollback()
+            return 0
+        created = create_low_stock_orders(db, new_low) if LOW_STOCK_AUTO_ORDER else []
+        if created:
+            bump_data_version(db)
+            record_changes(db, 'order', [(item_id, None, None) for _, item_id in created])
+        queued = queue_low_stock_digest(db, check_date, checked_by, new_low, created)
+        db.commit()
+    except Exception:
+        db.rollback()
+        app.logger.exception('Low-stock alert failed for %s', check_date)
+        return 0
+
+    if queued:
+        wake_outbox()
+    for order_id, item_id in created:
+        _change_broker.publish('order', {'version': get_data_version(db), 'order_id': order_id,
+                                         'item_id': item_id, 'status': 'pending', 'by': LOW_STOCK_REQUESTER})
+    return len(created)
 
 
 # ============================================================
 # Item 3: Refuse empty entries + Item 1: Number-only input
 # ============================================================
 
+# Posted quantity cell: qty_<item_id>_<team_key>
+QTY_FIELD_RE = re.compile(r'^qty_(\d+)_(\w+)$')
+
+
 @app.route('/submit_check', methods=['POST'])
 @login_required
 def submit_check():
@@ -913,51 +2400,56 @@ def submit_check():
             flash('Only the on-duty group can submit stock checks today.', 'danger')
             return redirect(url_for('dashboard', date=check_date))
 
-    items = db.execute('SELECT * FROM items ORDER BY sort_order').fetchall()
+    catalog = get_item_catalog(db)
+    items_by_id = catalog['by_id']
+    item_position = catalog['position']
 
     # Build team key → group name mapping
-    key_to_group = {t['key']: t['name'] for t in _teams_config['teams']}
+    key_to_group = get_teams().key_to_group
+    team_position = {tk: pos for pos, tk in enumerate(key_to_group)}
 
-    # Determine which team keys to scan
+    # Team columns each category may be written to, decided once per request
     if is_admin:
-        team_keys = list(key_to_group.keys())  # All: A, B, C, D, E
-    elif has_tips_access(user_group):
-        team_keys = list(key_to_group.keys())  # Tips-access group can submit Tips for all groups
+        tips_keys = common_keys = set(key_to_group)  # All: A, B, C, D, E
     else:
         own_key = get_team_key_for_group(user_group)
-        team_keys = [own_key]
+        # Tips-access group can submit Tips for all groups
+        tips_keys = set(key_to_group) if has_tips_access(user_group) else {own_key}
+        # Common items: only in the user's own column, and only for the duty group
+        common_keys = {own_key} if user_group == duty_group else set()
+
+    # Only the posted quantity fields are parsed; empty and foreign cells cost nothing
+    cells = []
+    for field, value in request.form.items():
+        m = QTY_FIELD_RE.match(field)
+        if not m or not value.strip():
+            continue
+        item = items_by_id.get(int(m.group(1)))
+        tk = m.group(2)
+        if item is None or tk not in key_to_group:
+            continue
+        if tk not in (tips_keys if item['category'] == 'Dr.Lee' else common_keys):
+            continue
+        cells.append((team_position[tk], item_position[item['id']], tk, item, value.strip()))
+    cells.sort(key=lambda cell: cell[:2])
 
     errors = []
     entries_by_group = {}  # group_name → list of tuples
 
-    for tk in team_keys:
+    for _, _, tk, item, qty_str in cells:
         gname = key_to_group[tk]
-        is_drlee = (gname == 'Dr.Lee/Zhijun')
-
-        for item in items:
-            # Common items: only in user's own column (unless admin)
-            if not is_admin and item['category'] != 'Dr.Lee' and gname != user_group:
-                continue
-            # Non-duty group: only Dr.Lee items allowed (even in own column)
-            if not is_admin and user_group != duty_group and item['category'] != 'Dr.Lee':
-                continue
-
-            qty_str = request.form.get(f'qty_{item["id"]}_{tk}', '').strip()
-            note = request.form.get(f'note_{item["id"]}_{tk}', '').strip()
-
-            if not qty_str:
-                continue
+        note = request.form.get(f'note_{item["id"]}_{tk}', '').strip()
 
-            if not is_valid_number(qty_str):
-                errors.append(f'{item["item_name"]} (Team {tk}): not a valid number')
-                continue
+        if not is_valid_number(qty_str):
+            errors.append(f'{item["item_name"]} (Team {tk}): not a valid number')
+            continue
 
-            qty_val = float(qty_str)
-            status = compute_status(qty_val, item['min_value'])
+        qty_val = float(qty_str)
+        status = compute_status(qty_val, item['min_value'])
 
-            if gname not in entries_by_group:
-                entries_by_group[gname] = []
-            entries_by_group[gname].append((item['id'], gname, username, qty_str, status, note, check_date))
+        if gname not in entries_by_group:
+            entries_by_group[gname] = []
+        entries_by_group[gname].append((item['id'], qty_str, status, note))
 
     if errors:
         flash('Submission rejected. Fix the following: ' + '; '.join(errors[:10]), 'danger')
@@ -978,22 +2470,42 @@ def submit_check():
     total_entries = 0
     groups_updated = []
 
+    changed_cells = []
+    event_cells = []
+    submitted_cells = []
+
     for gname, entries in entries_by_group.items():
-        db.execute(f'DELETE FROM "{table_name}" WHERE group_name = ? AND check_date = ?',
-                   (gname, check_date))
-        for entry in entries:
-            db.execute(
-                f'INSERT INTO "{table_name}" (item_id, group_name, checked_by, quantity, status, note, check_date, created_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)',
-                entry + (ts,)
-            )
+        changed = write_group_checks(db, table_name, gname, check_date, entries, username, ts)
+        changed_cells += [(item_id, gname, check_date) for item_id in changed]
+        submitted = {entry[0]: entry for entry in entries}
+        for item_id, old_values in changed.items():
+            quantity, status = submitted[item_id][1:3] if item_id in submitted else (None, None)
+            cell = {'item_id': item_id, 'group': gname, 'team_key': get_team_key_for_group(gname),
+                    'quantity': quantity, 'status': status}
+            event_cells.append(cell)
+            if item_id in submitted:
+                submitted_cells.append(dict(cell, check_date=check_date,
+                                            old_status=old_values[1] if old_values else None))
+        if changed:
+            record_group_submission(db, gname, check_date, username, len(entries), ts)
         total_entries += len(entries)
         groups_updated.append(gname)
 
+    # An identical resubmission writes nothing, so version-keyed caches stay valid
+    if changed_cells:
+        bump_data_version(db)
+        record_changes(db, 'check', changed_cells)
     db.commit()
+    if event_cells:
+        _change_broker.publish('check', {'version': get_data_version(db), 'check_date': check_date,
+                                         'checked_by': username, 'cells': event_cells})
+    orders_opened = after_check_submitted(db, check_date, username, submitted_cells)
     if len(groups_updated) == 1:
         flash(f'Stock check submitted ({total_entries} items for {groups_updated[0]}).', 'success')
     else:
         flash(f'Stock check submitted ({total_entries} items across {len(groups_updated)} groups).', 'success')
+    if orders_opened:
+        flash(f'{orders_opened} order request(s) opened for newly low or empty items.', 'info')
     return redirect(url_for('dashboard', date=check_date))
 
 
@@ -1003,6 +2515,7 @@ def submit_check():
 
 @app.route('/history')
 @login_required
+@conditional_get
 def history():
     db = get_db()
     page = request.args.get('page', 1, type=int)
@@ -1015,63 +2528,45 @@ def history():
         return render_template('history.html', rows=[], page=1, total_pages=1, total=0,
                                group_filter=group_filter, date_filter=date_filter, dates=[])
 
-    # If filtering by date, only query the relevant monthly table
-    if date_filter:
-        target_table = get_checks_table(date_filter)
-        if target_table in all_tables:
-            tables_to_query = [target_table]
-        else:
-            tables_to_query = []
-    else:
-        tables_to_query = all_tables
-
-    if not tables_to_query:
-        return render_template('history.html', rows=[], page=1, total_pages=1, total=0,
-                               group_filter=group_filter, date_filter=date_filter, dates=[])
-
-    # Build UNION ALL query
-    union_parts = []
-    params = []
-    for tbl in tables_to_query:
-        where = "WHERE 1=1"
-        if group_filter:
-            where += " AND c.group_name = ?"
-            params.append(group_filter)
-        if date_filter:
-            where += " AND c.check_date = ?"
-            params.append(date_filter)
-        union_parts.append(f'''
-            SELECT c.id, c.item_id, c.group_name, c.checked_by, c.quantity, c.status, c.note,
-                   c.check_date, c.created_at, i.item_name, i.stock_place, i.minimum
-            FROM "{tbl}" c JOIN items i ON c.item_id = i.id {where}
-        ''')
-
-    union_query = ' UNION ALL '.join(union_parts)
-
-    # Count
-    count_query = f"SELECT COUNT(*) FROM ({union_query})"
-    total = db.execute(count_query, params).fetchone()[0]
-
-    # Paginated query
-    full_query = f"{union_query} ORDER BY check_date DESC, item_name LIMIT ? OFFSET ?"
-    params_page = params + [per_page, (page - 1) * per_page]
-    rows = db.execute(full_query, params_page).fetchall()
-
+    # Only the monthly partitions that can hold the filtered date are touched
+    filters = {'group': group_filter or None,
+               'date_from': date_filter or None, 'date_to': date_filter or None}
+    total = cached_count_checks(db, **filters)
     total_pages = max(1, (total + per_page - 1) // per_page)
 
-    # Get distinct dates across all tables
-    date_union_parts = [f'SELECT DISTINCT check_date FROM "{tbl}"' for tbl in all_tables]
-    date_union = ' UNION '.join(date_union_parts)
-    dates = db.execute(f'{date_union} ORDER BY check_date DESC').fetchall()
+    # Keyset pagination: follow the cursor from the Prev/Next links when present,
+    # fall back to OFFSET only for a bare ?page=N
+    after = decode_checks_cursor(request.args.get('after', ''))
+    before = decode_checks_cursor(request.args.get('before', ''))
+    if before:
+        rows, has_more = keyset_checks(db, before=before, limit=per_page, **filters)
+        has_next = True
+        # Walking backwards: no more rows means we are on the first page
+        page = max(page, 2) if has_more else 1
+    elif after or page <= 1:
+        rows, has_next = keyset_checks(db, after=after, limit=per_page, **filters)
+        page = max(page, 2) if after else 1
+    else:
+        rows = query_checks(db, order_by=KEYSET_ORDER, limit=per_page + 1,
+                            offset=(page - 1) * per_page, **filters)
+        has_next = len(rows) > per_page
+        rows = rows[:per_page]
+    next_cursor = encode_checks_cursor(rows[-1]) if rows and has_next else ''
+    prev_cursor = encode_checks_cursor(rows[0]) if rows and page > 1 else ''
+
+    # Distinct dates for the filter dropdown (cached until the next write)
+    dates = get_check_dates(db)
 
     return render_template('history.html',
                            rows=rows,
                            page=page,
                            total_pages=total_pages,
                            total=total,
+                           next_cursor=next_cursor,
+                           prev_cursor=prev_cursor,
                            group_filter=group_filter,
                            date_filter=date_filter,
-                           dates=[d['check_date'] for d in dates])
+                           dates=dates)
 
 
 # ============================================================
@@ -1091,26 +2586,27 @@ def create_order_request():
         flash('Invalid item.', 'danger')
         return redirect(url_for('dashboard'))
 
-    existing = db.execute(
-        "SELECT id FROM order_requests WHERE item_id = ? AND status IN ('pending', 'ordered')",
-        (item_id,)
-    ).fetchone()
-    if existing:
+    if has_open_order(db, item_id):
         flash('An order request already exists for this item.', 'warning')
         return redirect(url_for('dashboard'))
 
     group_name = session.get('group_name', '')
-    db.execute(
+    cur = db.execute(
         'INSERT INTO order_requests (item_id, requested_by, requested_by_group, quantity_needed, note, created_at) VALUES (?, ?, ?, ?, ?, ?)',
         (item_id, username, group_name, quantity_needed, note, now_kst())
     )
+    bump_data_version(db)
+    record_changes(db, 'order', [(item_id, None, None)])
     db.commit()
+    _change_broker.publish('order', {'version': get_data_version(db), 'order_id': cur.lastrowid,
+                                     'item_id': item_id, 'status': 'pending', 'by': username})
     flash('Order request created.', 'success')
     return redirect(url_for('dashboard'))
 
 
 @app.route('/orders')
 @login_required
+@conditional_get
 def orders():
     db = get_db()
     status_filter = request.args.get('status', '')
@@ -1167,7 +2663,15 @@ def update_order(order_id):
             'UPDATE order_requests SET status = ? WHERE id = ?',
             (new_status, order_id)
         )
+    bump_data_version(db)
+    order_item = db.execute('SELECT item_id FROM order_requests WHERE id = ?', (order_id,)).fetchone()
+    if order_item:
+        record_changes(db, 'order', [(order_item['item_id'], None, None)])
     db.commit()
+    if order_item:
+        _change_broker.publish('order', {'version': get_data_version(db), 'order_id': order_id,
+                                         'item_id': order_item['item_id'], 'status': new_status,
+                                         'by': actor})
     flash(f'Order status updated to {new_status}.', 'success')
     return redirect(url_for('orders'))
 
@@ -1179,6 +2683,8 @@ def delete_all_orders():
     db = get_db()
     count = db.execute('SELECT COUNT(*) FROM order_requests').fetchone()[0]
     db.execute('DELETE FROM order_requests')
+    bump_data_version(db)
+    record_changes(db, 'order')
     db.commit()
     flash(f'All order requests deleted ({count} records).', 'success')
     return redirect(url_for('orders'))
@@ -1202,6 +2708,7 @@ def admin_panel():
 def approve_user(user_id):
     db = get_db()
     db.execute('UPDATE users SET approved = 1 WHERE id = ?', (user_id,))
+    bump_data_version(db)
     db.commit()
     flash('User approved.', 'success')
     return redirect(url_for('admin_panel'))
@@ -1215,6 +2722,7 @@ def delete_user(user_id):
         return redirect(url_for('admin_panel'))
     db = get_db()
     db.execute('DELETE FROM users WHERE id = ?', (user_id,))
+    bump_data_version(db)
     db.commit()
     flash('User deleted.', 'success')
     return redirect(url_for('admin_panel'))
@@ -1230,6 +2738,7 @@ def update_user(user_id):
 
     db.execute('UPDATE users SET role = ?, group_name = ?, display_name = ? WHERE id = ?',
                (role, group_name, display_name, user_id))
+    bump_data_version(db)
     db.commit()
     flash('User updated.', 'success')
     return redirect(url_for('admin_panel'))
@@ -1250,6 +2759,13 @@ def reset_password(user_id):
     return redirect(url_for('admin_panel'))
 
 
+@app.route('/admin/pool_stats')
+@admin_required
+def pool_stats():
+    """Connection pool counters for diagnosing load on duty day."""
+    return jsonify(_db_pool.stats())
+
+
 # ============================================================
 # Routes: Admin — Delete Check Records (Item 6: monthly tables)
 # ============================================================
@@ -1262,12 +2778,21 @@ def delete_check(check_id):
     check_date = request.args.get('date', '')
     if check_date:
         table_name = get_checks_table(check_date)
-        if table_name in get_all_checks_tables(db):
-            db.execute(f'DELETE FROM "{table_name}" WHERE id = ?', (check_id,))
+        tables = [table_name] if checks_table_exists(db, table_name) else []
     else:
         # Search all tables
-        for tbl in get_all_checks_tables(db):
+        tables = get_all_checks_tables(db)
+    affected_groups = set()
+    deleted_cells = []
+    for tbl in tables:
+        row = db.execute(f'SELECT item_id, group_name, check_date FROM "{tbl}" WHERE id = ?', (check_id,)).fetchone()
+        if row:
+            affected_groups.add(row['group_name'])
+            deleted_cells.append((row['item_id'], row['group_name'], row['check_date']))
             db.execute(f'DELETE FROM "{tbl}" WHERE id = ?', (check_id,))
+    refresh_group_summary(db, affected_groups)
+    bump_data_version(db)
+    record_changes(db, 'check', deleted_cells)
     db.commit()
     flash('Check record deleted.', 'success')
     return redirect(request.referrer or url_for('history'))
@@ -1283,17 +2808,24 @@ def delete_checks_bulk():
 
     if check_date:
         table_name = get_checks_table(check_date)
-        if table_name in get_all_checks_tables(db):
+        if checks_table_exists(db, table_name):
             if group_name:
                 db.execute(f'DELETE FROM "{table_name}" WHERE group_name = ? AND check_date = ?',
                            (group_name, check_date))
+                refresh_group_summary(db, [group_name])
                 flash(f'All checks for {group_name} on {check_date} deleted.', 'success')
             else:
+                affected = [r['group_name'] for r in db.execute(
+                    'SELECT group_name FROM group_check_summary WHERE last_check_date = ?', (check_date,))]
                 db.execute(f'DELETE FROM "{table_name}" WHERE check_date = ?', (check_date,))
+                refresh_group_summary(db, affected)
                 flash(f'All checks for {check_date} deleted.', 'success')
     else:
         flash('Please specify at least a date.', 'danger')
 
+    bump_data_version(db)
+    if check_date:
+        record_changes(db, 'check', [(None, group_name or None, check_date)])
     db.commit()
     return redirect(url_for('history'))
 
@@ -1309,6 +2841,9 @@ def delete_all_checks():
         count = db.execute(f'SELECT COUNT(*) FROM "{tbl}"').fetchone()[0]
         total += count
         db.execute(f'DELETE FROM "{tbl}"')
+    db.execute('DELETE FROM group_check_summary')
+    bump_data_version(db)
+    record_changes(db, 'check')
     db.commit()
     flash(f'All check history deleted ({total} records from {len(tables)} tables).', 'success')
     return redirect(url_for('history'))
@@ -1322,7 +2857,7 @@ def delete_all_checks():
 @admin_required
 def admin_items():
     db = get_db()
-    items = db.execute('SELECT * FROM items ORDER BY sort_order').fetchall()
+    items = get_item_catalog(db)['items']
     return render_template('admin_items.html', items=items)
 
 
@@ -1345,6 +2880,7 @@ def add_item():
         'INSERT INTO items (stock_place, item_name, minimum, min_value, min_unit, category, sort_order) VALUES (?, ?, ?, ?, ?, ?, ?)',
         (stock_place, item_name, minimum, min_value, min_unit, category, max_order + 1)
     )
+    invalidate_item_catalog(db)
     db.commit()
     flash(f'Item "{item_name}" added.', 'success')
     return redirect(url_for('admin_items'))
@@ -1368,6 +2904,7 @@ def edit_item(item_id):
         'UPDATE items SET stock_place=?, item_name=?, minimum=?, min_value=?, min_unit=?, category=?, sort_order=? WHERE id=?',
         (stock_place, item_name, minimum, min_value, min_unit, category, sort_order, item_id)
     )
+    invalidate_item_catalog(db)
     db.commit()
     flash(f'Item "{item_name}" updated.', 'success')
     return redirect(url_for('admin_items'))
@@ -1378,6 +2915,8 @@ def edit_item(item_id):
 def delete_item(item_id):
     db = get_db()
     db.execute('DELETE FROM items WHERE id = ?', (item_id,))
+    refresh_group_summary(db, get_groups())
+    invalidate_item_catalog(db)
     db.commit()
     flash('Item deleted.', 'success')
     return redirect(url_for('admin_items'))
@@ -1387,6 +2926,9 @@ def delete_item(item_id):
 # Routes: Export (Item 7: UTF-8 BOM, Item 6: monthly tables)
 # ============================================================
 
+EXPORT_CHUNK_ROWS = 500
+
+
 @app.route('/export')
 @admin_required
 def export_csv():
@@ -1394,53 +2936,33 @@ def export_csv():
     db = get_db()
     check_date = request.args.get('date', '')
 
-    if check_date:
-        tables_to_query = [get_checks_table(check_date)]
-    else:
-        tables_to_query = get_all_checks_tables(db)
-
-    if not tables_to_query:
+    if not check_date and not get_all_checks_tables(db):
         flash('No data to export.', 'warning')
         return redirect(url_for('dashboard'))
 
-    # Query all relevant tables
-    all_rows = []
-    for tbl in tables_to_query:
-        if tbl not in get_all_checks_tables(db):
-            continue
-        query = f'''
-            SELECT c.check_date, c.group_name, c.checked_by, i.stock_place, i.item_name,
-                   i.minimum, c.quantity, c.status, c.note, c.created_at
-            FROM "{tbl}" c
-            JOIN items i ON c.item_id = i.id
-            INNER JOIN (
-                SELECT MAX(id) as max_id
-                FROM "{tbl}"
-        '''
-        params = []
-        if check_date:
-            query += ' WHERE check_date = ?'
-            params.append(check_date)
-        query += f'''
-                GROUP BY item_id, group_name, check_date
-            ) latest ON c.id = latest.max_id
-            ORDER BY c.check_date DESC, i.sort_order, c.group_name
-        '''
-        rows = db.execute(query, params).fetchall()
-        all_rows.extend(rows)
-
-    output = io.StringIO()
-    # Item 7: UTF-8 BOM (handled by utf-8-sig encoding below)
-    writer = csv.writer(output)
-    writer.writerow(['Date', 'Group', 'Checked By', 'Location', 'Item', 'Minimum', 'Quantity', 'Status', 'Note', 'Timestamp (KST)'])
-    for row in all_rows:
-        writer.writerow([row['check_date'], row['group_name'], row['checked_by'],
-                         row['stock_place'], row['item_name'], row['minimum'],
-                         row['quantity'], row['status'], row['note'], row['created_at']])
+    # One record per item+group+date, newest month first, read lazily from the cursor
+    rows = iter_checks(db, date_from=check_date or None, date_to=check_date or None,
+                       order_by='check_date DESC, sort_order, group_name')
+
+    def generate():
+        # Item 7: UTF-8 BOM first, then the CSV in chunks
+        yield codecs.BOM_UTF8
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['Date', 'Group', 'Checked By', 'Location', 'Item', 'Minimum', 'Quantity', 'Status', 'Note', 'Timestamp (KST)'])
+        for n, row in enumerate(rows, 1):
+            writer.writerow([row['check_date'], row['group_name'], row['checked_by'],
+                             row['stock_place'], row['item_name'], row['minimum'],
+                             row['quantity'], row['status'], row['note'], row['created_at']])
+            if n % EXPORT_CHUNK_ROWS == 0:
+                yield output.getvalue().encode('utf-8')
+                output.seek(0)
+                output.truncate(0)
+        yield output.getvalue().encode('utf-8')
 
     filename = f'stock_check_{check_date or "all"}.csv'
     resp = Response(
-        output.getvalue().encode('utf-8-sig'),
+        stream_with_context(generate()),
         mimetype='text/csv',
         headers={'Content-Disposition': f'attachment; filename={filename}'}
     )
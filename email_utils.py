@@ -1,11 +1,18 @@
 """
 Email utility for Nano Lab Stock Check System.
 Sends verification, password reset, and duty alert emails via SMTP.
+
+A Mailer keeps one authenticated SMTP connection open and reuses it for
+every message (send_many() sends a whole batch over it). For a local
+stand-in server, set "smtp_starttls": false and "smtp_auth": false in the
+config dict, e.g. against `python -m aiosmtpd -n -l localhost:1025`.
 """
 
 import os
 import json
+import time
 import smtplib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 
@@ -20,31 +27,140 @@ def load_email_config():
         return json.load(f)
 
 
-def send_email(to_email, subject, html_body):
-    """Send an email using SMTP settings from email_config.json.
-    Returns True on success, error string on failure."""
-    config = load_email_config()
+def config_error(config):
+    """Return why `config` cannot send mail, or None if it is usable."""
     if not config:
         return 'Email not configured (email_config.json missing)'
-
-    if config.get('sender_password', '') in ('', 'your-app-password-here'):
+    if config.get('smtp_auth', True) and config.get('sender_password', '') in ('', 'your-app-password-here'):
         return 'Email not configured (set sender_password in email_config.json)'
+    return None
+
 
+def build_message(config, to_email, subject, html_body):
     msg = MIMEMultipart('alternative')
     msg['Subject'] = subject
     msg['From'] = f"{config.get('sender_name', 'Stock Check')} <{config['sender_email']}>"
     msg['To'] = to_email
 
     msg.attach(MIMEText(html_body, 'html'))
+    return msg
+
 
-    try:
-        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'])
-        server.ehlo()
-        server.starttls()
-        server.ehlo()
-        server.login(config['sender_email'], config['sender_password'])
-        server.sendmail(config['sender_email'], to_email, msg.as_string())
-        server.quit()
+def is_transient(exc):
+    """True for failures worth retrying: dropped connections, timeouts, 4xx replies."""
+    if isinstance(exc, smtplib.SMTPResponseException):
+        return 400 <= exc.smtp_code < 500
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
         return True
-    except Exception as e:
-        return str(e)
+    if isinstance(exc, smtplib.SMTPException):
+        return False  # Refused recipients, unsupported STARTTLS, ...
+    return isinstance(exc, OSError)
+
+
+class Mailer:
+    """SMTP sender that reuses one authenticated connection across messages.
+    Transient failures are retried up to `max_retries` times, reconnecting
+    when the connection was lost; a connection idle longer than `max_idle` seconds is replaced before
+    use. Results follow send_email(): True on success, error string on failure."""
+
+    def __init__(self, config, max_retries=2, retry_delay=1.0, timeout=30, max_idle=60):
+        self.config = config
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.timeout = timeout
+        self.max_idle = max_idle
+        self._lock = threading.RLock()
+        self._server = None
+        self._last_used = 0.0
+
+    def _connect(self):
+        config = self.config
+        server = smtplib.SMTP(config['smtp_server'], config['smtp_port'], timeout=self.timeout)
+        try:
+            server.ehlo()
+            if config.get('smtp_starttls', True):
+                server.starttls()
+                server.ehlo()
+            if config.get('smtp_auth', True):
+                server.login(config['sender_email'], config['sender_password'])
+        except BaseException:
+            server.close()
+            raise
+        return server
+
+    def _connection(self):
+        if self._server is not None and time.monotonic() - self._last_used > self.max_idle:
+            self.close()
+        if self._server is None:
+            self._server = self._connect()
+        return self._server
+
+    def close(self):
+        """Quit the open connection, if any."""
+        with self._lock:
+            server, self._server = self._server, None
+            if server is None:
+                return
+            try:
+                server.quit()
+            except (smtplib.SMTPException, OSError):
+                server.close()
+
+    def send(self, to_email, subject, html_body):
+        error = config_error(self.config)
+        if error:
+            return error
+        msg = build_message(self.config, to_email, subject, html_body).as_string()
+        with self._lock:
+            for attempt in range(self.max_retries + 1):
+                try:
+                    self._connection().sendmail(self.config['sender_email'], to_email, msg)
+                    self._last_used = time.monotonic()
+                    return True
+                except Exception as e:
+                    # A rejected reply leaves the session usable; anything else starts fresh
+                    if not isinstance(e, (smtplib.SMTPResponseException, smtplib.SMTPRecipientsRefused)):
+                        self.close()
+                    if not is_transient(e) or attempt == self.max_retries:
+                        return str(e)
+                    time.sleep(self.retry_delay * (attempt + 1))
+
+    def send_many(self, messages):
+        """Send [(to_email, subject, html_body)] over one connection; returns results in order."""
+        with self._lock:
+            return [self.send(to_email, subject, html_body) for to_email, subject, html_body in messages]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+_mailer = None
+_mailer_mtime = None
+_mailer_lock = threading.Lock()
+
+
+def get_mailer():
+    """Shared Mailer for email_config.json, rebuilt only when the file changes."""
+    global _mailer, _mailer_mtime
+    mtime = os.path.getmtime(_config_path) if os.path.exists(_config_path) else None
+    with _mailer_lock:
+        if _mailer is None or mtime != _mailer_mtime:
+            if _mailer is not None:
+                _mailer.close()
+            _mailer = Mailer(load_email_config())
+            _mailer_mtime = mtime
+        return _mailer
+
+
+def send_email(to_email, subject, html_body):
+    """Send an email using SMTP settings from email_config.json.
+    Returns True on success, error string on failure."""
+    return get_mailer().send(to_email, subject, html_body)
+
+
+def send_many(messages):
+    """Send [(to_email, subject, html_body)] over one shared connection; returns results in order."""
+    return get_mailer().send_many(messages)
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Duty rotation calendar for the Nano Lab Stock Check System.
+
+Built once from teams_config.json and shared by app.py and send_duty_alert.py.
+Duty days fall every `rotation_interval_days` from `rotation_start`, cycling
+through `rotation_order`; every lookup is plain date arithmetic, memoized per date.
+"""
+
+from collections import namedtuple
+from datetime import date, timedelta
+from functools import lru_cache
+
+# Same field order as the tuple app.get_rotation_info() has always returned
+RotationInfo = namedtuple('RotationInfo', [
+    'group', 'check_date', 'next_check_date', 'next_group', 'team_key', 'next_team_key'])
+
+DutyDay = namedtuple('DutyDay', ['date', 'team_key', 'group'])
+
+
+def _as_date(value):
+    return date.fromisoformat(value) if isinstance(value, str) else value
+
+
+class RotationCalendar:
+    """Immutable view of the rotation in a teams config dict."""
+
+    def __init__(self, config, memo_size=1024):
+        self.start = date.fromisoformat(config['rotation_start'])
+        self.interval = config['rotation_interval_days']
+        self.order = tuple(config['rotation_order'])
+        self.teams = {t['key']: t for t in config['teams']}
+        self.names = {t['key']: t['name'] for t in config['teams']}
+        self._info = lru_cache(maxsize=memo_size)(self._compute_info)
+
+    def period(self, for_date):
+        """Index of the duty period containing `for_date` (negative before rotation_start)."""
+        return (_as_date(for_date) - self.start).days // self.interval
+
+    def duty_date(self, period):
+        return self.start + timedelta(days=period * self.interval)
+
+    def team_key(self, period):
+        return self.order[period % len(self.order)]
+
+    def info(self, for_date):
+        """RotationInfo for the duty period containing `for_date` (date or ISO string)."""
+        return self._info(_as_date(for_date))
+
+    def _compute_info(self, for_date):
+        period = self.period(for_date)
+        if period < 0:
+            first_key = self.order[0]
+            return RotationInfo(self.names[first_key], self.start.isoformat(), None, None, first_key, None)
+        key = self.team_key(period)
+        next_key = self.team_key(period + 1)
+        return RotationInfo(self.names[key], self.duty_date(period).isoformat(),
+                            self.duty_date(period + 1).isoformat(), self.names[next_key],
+                            key, next_key)
+
+    def previous_check_date(self, for_date):
+        """Duty date one interval before the duty date of `for_date`'s period."""
+        return (date.fromisoformat(self.info(for_date).check_date) - timedelta(days=self.interval)).isoformat()
+
+    def is_duty_day(self, for_date):
+        for_date = _as_date(for_date)
+        return for_date >= self.start and (for_date - self.start).days % self.interval == 0
+
+    def duty_team(self, for_date):
+        """Team dict on duty if `for_date` is a check day, else None."""
+        if not self.is_duty_day(for_date):
+            return None
+        return self.teams[self.team_key(self.period(for_date))]
+
+    def upcoming(self, from_date, count):
+        """The next `count` duty days on or after `from_date`, as DutyDay tuples."""
+        from_date = _as_date(from_date)
+        period = max(0, -(-(from_date - self.start).days // self.interval))
+        days = []
+        for p in range(period, period + count):
+            key = self.team_key(p)
+            days.append(DutyDay(self.duty_date(p).isoformat(), key, self.names[key]))
+        return days
@@ -5,52 +5,189 @@ Duty Alert Email Sender for Nano Lab Stock Check System.
 Run daily at 00:00 UTC (= 09:00 KST) via PythonAnywhere scheduled task.
 Checks if today (KST) is a stock check day and sends reminder emails
 to the on-duty group members who have verified email addresses.
+
+Sends fan out over a small thread pool (one SMTP connection per worker).
+Each recipient is first claimed in notification_log (status 'sending'),
+and only the rows this run claimed are sent; each outcome is written back
+as soon as that message finishes. A rerun therefore skips members already
+sent, queued or being sent, and retries only failures and claims left
+behind by a run that died (after CLAIM_TIMEOUT_MINUTES).
+
+The web app's reminder rules (teams_config.json "reminders") include the
+same 'duty_reminder' at 09:00 KST. They run from `flask send-reminders` or
+the DUTY_SCHEDULER thread, and either one replaces this script, so keep only
+one scheduled. If both run, the shared claims in notification_log keep any
+member from getting the reminder twice, and this script warns that the
+app has already handled the date.
+
+Usage: python send_duty_alert.py [--workers N] [--date YYYY-MM-DD]
 """
 
 import os
 import sys
 import json
+import time
+import queue
 import sqlite3
-from datetime import datetime, timezone, timedelta
+import argparse
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, date, timezone, timedelta
 
-# Add parent dir to path so we can import email_utils
+# Add parent dir to path so we can import email_utils and rotation
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from email_utils import send_email
+from email_utils import Mailer, load_email_config
+from rotation import RotationCalendar
 
 KST = timezone(timedelta(hours=9))
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 DB_PATH = os.path.join(BASE_DIR, 'stock_check.db')
 CONFIG_PATH = os.path.join(BASE_DIR, 'teams_config.json')
 
+NOTIFICATION_KIND = 'duty_reminder'
+DEFAULT_WORKERS = 4
+# A 'sending' claim older than this belongs to a run that died; a rerun takes it over
+CLAIM_TIMEOUT_MINUTES = 10
+
 
 def load_config():
     with open(CONFIG_PATH, 'r') as f:
         return json.load(f)
 
 
-def get_duty_group_today(config):
-    """Check if today (KST) is a check day. Returns team dict or None."""
-    from datetime import date as date_type
-    today = datetime.now(KST).date()
-    start = date_type.fromisoformat(config['rotation_start'])
-    interval = config['rotation_interval_days']
-    order = config['rotation_order']
-    teams = {t['key']: t for t in config['teams']}
-
-    days_since = (today - start).days
-    if days_since < 0:
-        return None
-    if days_since % interval != 0:
-        return None  # Not a check day
+def get_duty_group_today(config, for_date=None):
+    """Check if `for_date` (default: today KST) is a check day. Returns team dict or None."""
+    return RotationCalendar(config).duty_team(for_date or datetime.now(KST).date())
+
+
+def ensure_notification_log(db):
+    """One row per (kind, duty date, recipient); a rerun updates the row in place."""
+    db.execute('''
+        CREATE TABLE IF NOT EXISTS notification_log (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            kind TEXT NOT NULL,
+            duty_date TEXT NOT NULL,
+            group_name TEXT NOT NULL DEFAULT '',
+            email TEXT NOT NULL,
+            display_name TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL,
+            error TEXT NOT NULL DEFAULT '',
+            attempts INTEGER NOT NULL DEFAULT 1,
+            elapsed_ms INTEGER NOT NULL DEFAULT 0,
+            notified_at TEXT NOT NULL DEFAULT '',
+            outbox_id INTEGER,
+            UNIQUE(kind, duty_date, email)
+        )
+    ''')
+
+
+def claim_recipients(db, kind, duty_date, group_name, members):
+    """Mark each member 'sending' for (kind, duty_date) and return the ones this run claimed.
+    Members already sent, queued (by the app's reminder scheduler) or claimed by a live
+    run are left out; failed rows and stale claims are taken over."""
+    now = datetime.now(KST)
+    ts = now.strftime('%Y-%m-%d %H:%M:%S')
+    stale = (now - timedelta(minutes=CLAIM_TIMEOUT_MINUTES)).strftime('%Y-%m-%d %H:%M:%S')
+    claimed = []
+    db.execute('BEGIN IMMEDIATE')
+    try:
+        for member in members:
+            cur = db.execute('''
+                INSERT OR IGNORE INTO notification_log (kind, duty_date, group_name, email, display_name, status, attempts, notified_at)
+                VALUES (?, ?, ?, ?, ?, 'sending', 0, ?)
+            ''', (kind, duty_date, group_name, member['email'], member['display_name'], ts))
+            if not cur.rowcount:
+                cur = db.execute('''
+                    UPDATE notification_log SET status = 'sending', notified_at = ?
+                    WHERE kind = ? AND duty_date = ? AND email = ?
+                      AND (status = 'failed' OR (status = 'sending' AND notified_at < ?))
+                ''', (ts, kind, duty_date, member['email'], stale))
+            if cur.rowcount:
+                claimed.append(member)
+        db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    return claimed
+
+
+def scheduler_claimed(db, kind, duty_date):
+    """True if the web app's reminder scheduler has claimed `kind` for `duty_date` (its group row, email '')."""
+    return db.execute("SELECT 1 FROM notification_log WHERE kind = ? AND duty_date = ? AND email = ''",
+                      (kind, duty_date)).fetchone() is not None
+
+
+def record_outcome(db, kind, duty_date, member, result, elapsed_ms):
+    """Store one claimed member's send result in notification_log."""
+    db.execute('''
+        UPDATE notification_log SET status = ?, error = ?, attempts = attempts + 1, elapsed_ms = ?, notified_at = ?
+        WHERE kind = ? AND duty_date = ? AND email = ?
+    ''', ('sent' if result is True else 'failed', '' if result is True else str(result), elapsed_ms,
+          datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S'), kind, duty_date, member['email']))
+    db.commit()
+
+
+def _send_chunk(email_config, chunk, results):
+    """Send [(member, subject, html)] over one connection, putting (member, result, elapsed_ms) on `results`."""
+    try:
+        with Mailer(email_config) as mailer:
+            for member, subject, html_body in chunk:
+                started = time.perf_counter()
+                result = mailer.send(member['email'], subject, html_body)
+                results.put((member, result, int((time.perf_counter() - started) * 1000)))
+    finally:
+        results.put(None)  # This chunk is done
+
+
+def dispatch(messages, workers=DEFAULT_WORKERS, on_outcome=None):
+    """Fan [(member, subject, html)] out over at most `workers` threads, each with its own SMTP connection.
+    `on_outcome(member, result, elapsed_ms)` runs in the calling thread as each message finishes.
+    Returns [(member, result, elapsed_ms)] in completion order."""
+    if not messages:
+        return []
+    email_config = load_email_config()
+    workers = max(1, min(workers, len(messages)))
+    chunks = [messages[i::workers] for i in range(workers)]
+    results = queue.Queue()
+    outcomes = []
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_send_chunk, email_config, chunk, results) for chunk in chunks]
+        running = len(chunks)
+        while running:
+            outcome = results.get()
+            if outcome is None:
+                running -= 1
+                continue
+            outcomes.append(outcome)
+            if on_outcome:
+                on_outcome(*outcome)
+        for future in futures:
+            future.result()
+    return outcomes
+
+
+def build_reminder(member, team, today_str):
+    return f"""
+        <div style="font-family: sans-serif; max-width: 500px; margin: auto; padding: 20px;">
+            <h2 style="color: #1a237e;">Stock Check Reminder</h2>
+            <p>Hello <strong>{member['display_name']}</strong>,</p>
+            <p>Today (<strong>{today_str}</strong>) is your group's stock check day.</p>
+            <p>Group: <strong>Team {team['key']} ({team['name']})</strong></p>
+            <p>Please log in and submit your stock check at your earliest convenience.</p>
+            <hr style="border: none; border-top: 1px solid #ddd;">
+            <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
+        </div>
+        """
 
-    period = days_since // interval
-    key = order[period % len(order)]
-    return teams[key]
 
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Send stock check duty reminders.')
+    parser.add_argument('--workers', type=int, default=DEFAULT_WORKERS, help='parallel SMTP connections')
+    parser.add_argument('--date', type=date.fromisoformat, default=None, help='duty date to send for (default: today KST)')
+    args = parser.parse_args(argv)
 
-def main():
     config = load_config()
-    team = get_duty_group_today(config)
+    duty_date = args.date or datetime.now(KST).date()
+    team = get_duty_group_today(config, duty_date)
 
     if not team:
         print(f"[{datetime.now(KST).strftime('%Y-%m-%d %H:%M:%S')} KST] Not a check day. No emails sent.")
@@ -60,36 +197,45 @@ def main():
 
     db = sqlite3.connect(DB_PATH)
     db.row_factory = sqlite3.Row
+    ensure_notification_log(db)
     members = db.execute(
         "SELECT display_name, email FROM users WHERE group_name = ? AND email_verified = 1 AND email IS NOT NULL AND email != ''",
         (team['name'],)
     ).fetchall()
-    db.close()
 
     if not members:
+        db.close()
         print(f"  No verified email addresses for {team['name']}. No emails sent.")
         return
 
-    today_str = datetime.now(KST).strftime('%Y-%m-%d')
+    today_str = duty_date.isoformat()
     subject = f"[Nano Lab] Stock Check Duty Reminder - {today_str}"
 
-    for member in members:
-        html_body = f"""
-        <div style="font-family: sans-serif; max-width: 500px; margin: auto; padding: 20px;">
-            <h2 style="color: #1a237e;">Stock Check Reminder</h2>
-            <p>Hello <strong>{member['display_name']}</strong>,</p>
-            <p>Today (<strong>{today_str}</strong>) is your group's stock check day.</p>
-            <p>Group: <strong>Team {team['key']} ({team['name']})</strong></p>
-            <p>Please log in and submit your stock check at your earliest convenience.</p>
-            <hr style="border: none; border-top: 1px solid #ddd;">
-            <p style="font-size: 12px; color: #888;">Nano Lab Stock Check System</p>
-        </div>
-        """
-        result = send_email(member['email'], subject, html_body)
+    pending = claim_recipients(db, NOTIFICATION_KIND, today_str, team['name'], members)
+    if scheduler_claimed(db, NOTIFICATION_KIND, today_str):
+        print("  WARNING: the web app's reminder rules already handled this date; "
+              "schedule either this script or `flask send-reminders`, not both.")
+    if not pending:
+        db.close()
+        print(f"  All {len(members)} members already notified for {today_str}.")
+        return
+
+    started = time.perf_counter()
+    outcomes = dispatch([(member, subject, build_reminder(member, team, today_str)) for member in pending],
+                        workers=args.workers,
+                        on_outcome=lambda member, result, elapsed_ms: record_outcome(
+                            db, NOTIFICATION_KIND, today_str, member, result, elapsed_ms))
+    db.close()
+
+    sent = 0
+    for member, result, elapsed_ms in outcomes:
         if result is True:
-            print(f"  Sent to {member['display_name']} ({member['email']})")
+            sent += 1
+            print(f"  Sent to {member['display_name']} ({member['email']}) in {elapsed_ms} ms")
         else:
             print(f"  FAILED for {member['display_name']} ({member['email']}): {result}")
+    print(f"  {sent} sent, {len(outcomes) - sent} failed, {len(members) - len(pending)} skipped (already notified) "
+          f"in {time.perf_counter() - started:.1f}s")
 
 
 if __name__ == '__main__':
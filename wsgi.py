@@ -13,6 +13,11 @@ if str(project_home) not in sys.path:
 # Set the working directory
 os.chdir(project_home)
 
+# Background threads (OUTBOX_WORKER, DUTY_SCHEDULER) and the LIVE_FEED event stream
+# stay off here: PythonAnywhere's workers don't run app threads, and each open
+# stream would hold a whole single-threaded worker. Queued mail is retried by the `flask drain-outbox`
+# scheduled task instead (see the deployment notes, section 12).
+
 # Import your Flask app
 from app import app as application, init_db
 